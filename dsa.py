@@ -1,47 +1,252 @@
 import sys
-import json
 import os
-import random
-from datetime import datetime
+import time
+
+# Set before anything heavy is imported so DSA_TRACE_STARTUP covers imports
+_START = time.perf_counter()
+
+if __name__ == '__main__':
+    # Second launch (e.g. from the startup folder): hand off to the running
+    # window before paying for the widget imports
+    from dsa_instance import signalRunningInstance
+    if signalRunningInstance():
+        sys.exit(0)
+
+import gc
+import heapq
+from datetime import datetime, timedelta
+from string import Template
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, 
     QHBoxLayout, QLabel, QLineEdit, QPushButton, 
-    QScrollArea, QCheckBox, QFrame, QGridLayout
+    QListView, QStyledItemDelegate, QStyle, QFrame, QGridLayout, QMenu, QShortcut,
+    QToolTip, QListWidget, QListWidgetItem, QCompleter, QSystemTrayIcon
+)
+from PyQt5.QtGui import (
+    QColor, QPainter, QFont, QLinearGradient, QGradient, QBrush, QPen, QPixmap,
+    QStaticText, QKeySequence, QImage, QStandardItem, QStandardItemModel, QPixmapCache,
+    QIcon
 )
-from PyQt5.QtGui import QColor, QPainter, QFont, QLinearGradient, QBrush
 from PyQt5.QtCore import (
-    Qt, QPropertyAnimation, QEasingCurve, QRect, 
-    QSize, QTimer, pyqtProperty
+    Qt, QPropertyAnimation, QEasingCurve, QRect, QRectF, QPointF,
+    QSize, QTimer, QElapsedTimer, QEvent, QAbstractListModel, QModelIndex,
+    QObject, QRunnable, QThreadPool, QFileSystemWatcher, QSocketNotifier, pyqtProperty,
+    pyqtSignal
 )
 
-# Path to the JSON file
-JSON_PATH = r"C:\Users\risha\OneDrive\Desktop\Lab Practice\OOPS Lab 2\dsa_progress.json"
-
-# List of motivational quotes
-MOTIVATIONAL_QUOTES = [
-    "The only way to do great work is to love what you do. - Steve Jobs",
-    "It does not matter how slowly you go as long as you do not stop. - Confucius",
-    "Success is not final, failure is not fatal: It is the courage to continue that counts. - Winston Churchill",
-    "The future belongs to those who believe in the beauty of their dreams. - Eleanor Roosevelt",
-    "Don't watch the clock; do what it does. Keep going. - Sam Levenson",
-    "The secret of getting ahead is getting started. - Mark Twain",
-    "Believe you can and you're halfway there. - Theodore Roosevelt",
-    "Your time is limited, don't waste it living someone else's life. - Steve Jobs",
-    "It always seems impossible until it's done. - Nelson Mandela",
-    "The best way to predict the future is to create it. - Abraham Lincoln"
-]
+from dsa_core import Tracker, openStore
+from dsa_stats import StatsEngine
+from dsa_store import HistoryStore, WriteBehind
+
+# Print how long each startup phase took
+TRACE_STARTUP = os.environ.get("DSA_TRACE_STARTUP", "") not in ("", "0")
+
+# Optional repaint cap for the progress ring (0 = every animation frame)
+MAX_FPS = int(os.environ.get("DSA_MAX_FPS", "0"))
+
+# Sync clients write a replaced file in several steps; wait for them to settle
+SYNC_DEBOUNCE_MS = 400
+
+# Skip entry/fade/hover animations entirely
+REDUCED_MOTION = os.environ.get("DSA_REDUCED_MOTION", "") not in ("", "0")
+
+# Start in the system tray with no window (also: python dsa.py --tray)
+TRAY_MODE = os.environ.get("DSA_TRAY", "") not in ("", "0")
+# Tray reminder when questions are still open at this time (HH:MM; empty = off)
+REMIND_AT = os.environ.get("DSA_REMIND_AT", "20:00")
+
+###############################################################################
+#                                  THEME                                      #
+###############################################################################
+# Colors used by both the stylesheet and the custom-painted widgets. Painter
+# colors with alpha use #AARRGGBB, which QColor understands.
+THEMES = {
+    'purple': {
+        'window_start': '#2b5876', 'window_end': '#4e4376',
+        'text': '#ecf0f1', 'text_dim': 'rgba(236, 240, 241, 0.9)',
+        'accent': '#8e2de2', 'accent_dark': '#4a00e0',
+        'pressed_start': '#6a00b8', 'pressed_end': '#5a00a0',
+        'surface': '#34495e', 'panel': '#2c3e50', 'scroll_hover': '#3b5770',
+        'track': '#78282838', 'row_hover': '#0fecf0f1',
+        'indicator_border': '#c8ecf0f1', 'indicator_fill': '#28ecf0f1',
+    },
+    'midnight': {
+        'window_start': '#0f2027', 'window_end': '#203a43',
+        'text': '#e0e6ed', 'text_dim': 'rgba(224, 230, 237, 0.85)',
+        'accent': '#00b4db', 'accent_dark': '#0083b0',
+        'pressed_start': '#006e94', 'pressed_end': '#005a7a',
+        'surface': '#24323d', 'panel': '#1b262e', 'scroll_hover': '#35505f',
+        'track': '#78141e28', 'row_hover': '#0fe0e6ed',
+        'indicator_border': '#c8e0e6ed', 'indicator_fill': '#28e0e6ed',
+    },
+}
+DEFAULT_THEME = os.environ.get("DSA_THEME", "purple")
+
+# One stylesheet for the whole application; widgets are matched by objectName
+STYLESHEET = Template("""
+    QMainWindow {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:1,
+                                    stop:0 $window_start, stop:1 $window_end);
+        color: $text;
+    }
+    QLabel { color: $text; }
+    QLabel#dateLabel { color: $text_dim; }
+    QLabel#quoteTitle, QLabel#motivationLabel { color: $accent; }
+    QLabel#questionLabel { margin-top: 15px; }
+    QLabel#questionsLabel, QLabel#countLabel { margin-top: 20px; }
+    QLabel#progressLabel { margin-bottom: 20px; }
+    QLabel#motivationLabel { margin-top: 30px; }
+    QLabel#statsLabel { color: $text_dim; margin-top: 10px; }
+    QFrame#quoteFrame {
+        background: $surface;
+        border-radius: 10px;
+        margin: 10px 0px;
+    }
+    QFrame#quoteFrame QLabel { margin: 10px 0px; }
+    QLineEdit {
+        background: $surface;
+        border: none;
+        border-radius: 10px;
+        padding: 10px;
+        color: $text;
+    }
+    QPushButton#rippleButton {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:1,
+                                    stop:0 $accent, stop:1 $accent_dark);
+        color: white;
+        border: none;
+        border-radius: 10px;
+        padding: 10px 15px;
+        margin-top: 5px;
+    }
+    QPushButton#rippleButton:hover {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:1,
+                                    stop:0 $accent_dark, stop:1 $accent);
+    }
+    QPushButton#rippleButton:pressed {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:1,
+                                    stop:0 $pressed_start, stop:1 $pressed_end);
+    }
+    QListView#questionList {
+        background: $panel;
+        border: none;
+        border-radius: 10px;
+        padding: 10px;
+    }
+    QLineEdit#searchInput { padding: 6px 10px; }
+    QListWidget#searchResults {
+        background: $panel;
+        border: 1px solid $surface;
+        border-radius: 10px;
+        padding: 5px;
+        color: $text;
+    }
+    QListWidget#searchResults::item { padding: 4px; }
+    QListView#suggestions {
+        background: $panel;
+        color: $text;
+        border: 1px solid $surface;
+        selection-background-color: $surface;
+    }
+    QListWidget#searchResults::item:selected { background: $surface; }
+    QStatusBar { color: $text_dim; }
+    QLabel#perfOverlay {
+        background: rgba(0, 0, 0, 0.65);
+        color: #b8f5b8;
+        border-radius: 6px;
+        padding: 6px;
+    }
+    QScrollBar:vertical {
+        background: $panel;
+        width: 12px;
+        margin: 0;
+    }
+    QScrollBar::handle:vertical {
+        background: $surface;
+        min-height: 20px;
+        border-radius: 6px;
+    }
+    QScrollBar::handle:vertical:hover {
+        background: $scroll_hover;
+    }
+    QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {
+        height: 0;
+    }
+""")
+
+
+class ThemeEngine(QObject):
+    """Owns the application stylesheet and tells painted widgets about colors.
+
+    The stylesheet for a theme is compiled once and set on the QApplication,
+    so switching themes is a single repolish. Widgets that paint themselves
+    listen to ``themeChanged`` instead of carrying their own stylesheets.
+    """
+
+    themeChanged = pyqtSignal(dict)
+
+    def __init__(self, app, parent=None):
+        super().__init__(parent)
+        self.app = app
+        self.name = None
+        self.colors = {}
+        self._compiled = {}
+
+    def apply(self, name):
+        if name not in THEMES:
+            name = 'purple'
+        if name == self.name:
+            return
+        if name not in self._compiled:
+            self._compiled[name] = STYLESHEET.substitute(THEMES[name])
+        self.name = name
+        self.colors = THEMES[name]
+        self.app.setStyleSheet(self._compiled[name])
+        self.themeChanged.emit(self.colors)
+
+    def cycle(self):
+        names = list(THEMES)
+        self.apply(names[(names.index(self.name) + 1) % len(names)])
 
 ###############################################################################
 #                            CIRCULAR PROGRESS BAR                            #
 ###############################################################################
 class CircularProgressBar(QWidget):
+    """Progress ring whose static layers are cached as pixmaps.
+
+    The track and inner disc are rendered once per size/theme/DPR into
+    device-pixel-ratio aware pixmaps, so an animation frame is two blits,
+    one arc and a cached static text. ``setMaxFps`` optionally throttles
+    repaints for software-rendered or remote sessions.
+    """
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setMinimumSize(150, 150)
         self._progress = 0
         self._targetProgress = 0
 
+        self.track_color = QColor(40, 40, 60, 120)
+        self.disc_color = QColor("#2c3e50")
+        self.text_color = QColor("#ecf0f1")
+        self.arc_colors = (QColor("#8e2de2"), QColor("#4a00e0"))
+        self._font = QFont("Segoe UI", 18, QFont.Bold)
+        self._track_cache = None
+        self._disc_cache = None
+        self._arc_brush = None
+        self._text = QStaticText()
+        self._text_percentage = None
+
+        # Optional frame-rate cap; repaints in between are deferred, not lost
+        self._frame_interval = 0
+        self._frame_clock = QElapsedTimer()
+        self._frame_clock.start()
+        self._frame_timer = QTimer(self)
+        self._frame_timer.setSingleShot(True)
+        self._frame_timer.timeout.connect(self.update)
+
         # Animation for smooth progress transitions
+        self._animated = True
         self._animation = QPropertyAnimation(self, b"progress")
         self._animation.setDuration(800)
         self._animation.setEasingCurve(QEasingCurve.OutQuint)
@@ -51,135 +256,585 @@ class CircularProgressBar(QWidget):
 
     def setProgress(self, value):
         self._progress = value
-        self.update()
+        self._scheduleFrame()
 
     progress = pyqtProperty(float, getProgress, setProgress)
 
+    def setAnimated(self, animated):
+        self._animated = animated
+
     def setTargetProgress(self, value):
         self._targetProgress = value
+        if not self._animated:
+            self.setProgress(value)
+            return
         self._animation.setStartValue(self._progress)
         self._animation.setEndValue(value)
         self._animation.start()
 
-    def paintEvent(self, event):
-        painter = QPainter(self)
+    def setMaxFps(self, fps):
+        """Cap repaints to ``fps`` frames per second; 0 removes the cap."""
+        self._frame_interval = int(1000 / fps) if fps else 0
+
+    def setColors(self, track=None, disc=None, text=None, arc=None):
+        if track is not None:
+            self.track_color = QColor(track)
+        if disc is not None:
+            self.disc_color = QColor(disc)
+        if text is not None:
+            self.text_color = QColor(text)
+        if arc is not None:
+            self.arc_colors = tuple(QColor(c) for c in arc)
+        self.invalidateCache()
+
+    def applyTheme(self, colors):
+        self.setColors(track=colors['track'], disc=colors['panel'], text=colors['text'],
+                       arc=(colors['accent'], colors['accent_dark']))
+
+    def invalidateCache(self):
+        self._track_cache = None
+        self._disc_cache = None
+        self._arc_brush = None
+        self.update()
+
+    def _scheduleFrame(self):
+        if not self._frame_interval:
+            self.update()
+            return
+        if self._frame_timer.isActive():
+            return
+        remaining = self._frame_interval - self._frame_clock.elapsed()
+        if remaining <= 0:
+            self.update()
+        else:
+            self._frame_timer.start(remaining)
+
+    def resizeEvent(self, event):
+        self.invalidateCache()
+        super().resizeEvent(event)
+
+    def changeEvent(self, event):
+        if event.type() in (QEvent.StyleChange, QEvent.PaletteChange):
+            self.invalidateCache()
+        super().changeEvent(event)
+
+    def _renderLayer(self, color, inset):
+        dpr = self.devicePixelRatioF()
+        pixmap = QPixmap(self.size() * dpr)
+        pixmap.setDevicePixelRatio(dpr)
+        pixmap.fill(Qt.transparent)
+        painter = QPainter(pixmap)
         painter.setRenderHint(QPainter.Antialiasing)
-        
-        # Draw background circle (using a semi-transparent dark shade)
         painter.setPen(Qt.NoPen)
-        painter.setBrush(QColor(40, 40, 60, 120))
-        painter.drawEllipse(10, 10, self.width() - 20, self.height() - 20)
-        
-        # Draw progress arc with a modern purple gradient (matches button style)
+        painter.setBrush(color)
+        painter.drawEllipse(inset, inset, self.width() - 2 * inset, self.height() - 2 * inset)
+        painter.end()
+        return pixmap
+
+    def _ensureCache(self):
+        if self._track_cache is not None \
+                and self._track_cache.devicePixelRatio() == self.devicePixelRatioF():
+            return
+        # Background circle (semi-transparent dark shade) and the inner circle
+        # for the hollow effect
+        self._track_cache = self._renderLayer(self.track_color, 10)
+        self._disc_cache = self._renderLayer(self.disc_color, 30)
+        # Modern purple gradient for the arc (matches button style)
+        gradient = QLinearGradient(0, 0, self.width(), self.height())
+        gradient.setColorAt(0, self.arc_colors[0])
+        gradient.setColorAt(1, self.arc_colors[1])
+        self._arc_brush = QBrush(gradient)
+
+    def paintEvent(self, event):
+        self._frame_clock.restart()
+        self._ensureCache()
+        painter = QPainter(self)
+        painter.drawPixmap(0, 0, self._track_cache)
+
+        # Draw progress arc
         if self._progress > 0:
-            gradient = QLinearGradient(0, 0, self.width(), self.height())
-            gradient.setColorAt(0, QColor("#8e2de2"))
-            gradient.setColorAt(1, QColor("#4a00e0"))
-            painter.setBrush(QBrush(gradient))
+            painter.setRenderHint(QPainter.Antialiasing)
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(self._arc_brush)
             span_angle = int(-self._progress * 360 * 16)
             painter.drawPie(10, 10, self.width() - 20, self.height() - 20, 90 * 16, span_angle)
-        
-        # Draw inner circle for hollow effect with a complementary dark color
-        painter.setBrush(QColor("#2c3e50"))
-        painter.drawEllipse(30, 30, self.width() - 60, self.height() - 60)
-        
-        # Draw progress percentage text
-        painter.setPen(QColor("#ecf0f1"))
-        painter.setFont(QFont("Segoe UI", 18, QFont.Bold))
+
+        painter.drawPixmap(0, 0, self._disc_cache)
+
+        # Draw progress percentage text; only re-laid out when the number changes
         percentage = int(self._progress * 100)
-        painter.drawText(self.rect(), Qt.AlignCenter, f"{percentage}%")
+        if percentage != self._text_percentage:
+            self._text.setText(f"{percentage}%")
+            self._text.prepare(font=self._font)
+            self._text_percentage = percentage
+        painter.setPen(self.text_color)
+        painter.setFont(self._font)
+        size = self._text.size()
+        painter.drawStaticText(QPointF((self.width() - size.width()) / 2,
+                                       (self.height() - size.height()) / 2), self._text)
 
 ###############################################################################
-#                             ANIMATED CHECKBOX                               #
+#                              HEATMAP WIDGET                                 #
 ###############################################################################
-class AnimatedCheckBox(QWidget):
-    def __init__(self, text, parent=None):
+class HeatmapWidget(QWidget):
+    """GitHub-style grid of questions solved per day over the last year.
+
+    The grid lives in a cached image; a change to one day repaints just that
+    cell into the image and schedules an update of that cell's rectangle.
+    """
+
+    CELL = 10
+    GAP = 2
+    WEEKS = 53
+    # Solved-per-day thresholds for the four intensity levels
+    LEVELS = (1, 3, 6, 10)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        step = self.CELL + self.GAP
+        self.setFixedSize(self.WEEKS * step, 7 * step)
+        self.stats = None
+        self._image = None
+        self._colors = [QColor("#34495e")] + [QColor("#8e2de2")] * 4
+        self.applyTheme(THEMES['purple'])
+
+    def applyTheme(self, colors):
+        accent = QColor(colors['accent'])
+        self._colors = [QColor(colors['surface'])]
+        for alpha in (90, 150, 210, 255):
+            level = QColor(accent)
+            level.setAlpha(alpha)
+            self._colors.append(level)
+        self._image = None
+        self.update()
+
+    def setStats(self, stats):
+        self.stats = stats
+        today = stats.today
+        # Today sits in the last column; rows run Sunday..Saturday
+        self._start = today - timedelta(days=(self.WEEKS - 1) * 7 + self._row(today))
+        self._image = None
+        self.update()
+
+    def _row(self, day):
+        return (day.weekday() + 1) % 7
+
+    def cellRect(self, day):
+        offset = (day - self._start).days
+        step = self.CELL + self.GAP
+        return QRect((offset // 7) * step, (offset % 7) * step, self.CELL, self.CELL)
+
+    def dayAt(self, pos):
+        if self.stats is None:
+            return None
+        step = self.CELL + self.GAP
+        day = self._start + timedelta(days=(pos.x() // step) * 7 + pos.y() // step)
+        return day if self._start <= day <= self.stats.today else None
+
+    def _level(self, completed):
+        return sum(1 for threshold in self.LEVELS if completed >= threshold)
+
+    def _paintCell(self, painter, day):
+        painter.setBrush(self._colors[self._level(self.stats.completedOn(day))])
+        painter.drawRoundedRect(QRectF(self.cellRect(day)), 2, 2)
+
+    def _render(self):
+        dpr = self.devicePixelRatioF()
+        self._image = QImage(self.size() * dpr, QImage.Format_ARGB32_Premultiplied)
+        self._image.setDevicePixelRatio(dpr)
+        self._image.fill(Qt.transparent)
+        painter = QPainter(self._image)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(Qt.NoPen)
+        day = self._start
+        while day <= self.stats.today:
+            self._paintCell(painter, day)
+            day += timedelta(days=1)
+        painter.end()
+
+    def updateDay(self, day):
+        """Repaint one day's cell after its count changed."""
+        if self._image is None or self.stats is None:
+            return
+        rect = self.cellRect(day)
+        painter = QPainter(self._image)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setCompositionMode(QPainter.CompositionMode_Source)
+        painter.fillRect(rect, Qt.transparent)
+        painter.setCompositionMode(QPainter.CompositionMode_SourceOver)
+        painter.setPen(Qt.NoPen)
+        self._paintCell(painter, day)
+        painter.end()
+        self.update(rect)
+
+    def paintEvent(self, event):
+        if self.stats is None:
+            return
+        if self._image is None or self._image.devicePixelRatio() != self.devicePixelRatioF():
+            self._render()
+        painter = QPainter(self)
+        rect = event.rect()
+        dpr = self._image.devicePixelRatio()
+        source = QRectF(rect.x() * dpr, rect.y() * dpr, rect.width() * dpr, rect.height() * dpr)
+        painter.drawImage(QRectF(rect), self._image, source)
+
+    def event(self, event):
+        if event.type() == QEvent.ToolTip:
+            day = self.dayAt(event.pos())
+            if day is None:
+                QToolTip.hideText()
+            else:
+                total, completed = self.stats.counts(day)
+                QToolTip.showText(event.globalPos(),
+                                  f"{day.strftime('%a, %d %b %Y')}: {completed}/{total} solved", self)
+            return True
+        return super().event(event)
+
+###############################################################################
+#                           ANIMATION SCHEDULER                               #
+###############################################################################
+class AnimationScheduler(QObject):
+    """One frame timer driving every short-lived animation in the window.
+
+    Animations are queued with a staggered start and at most ``max_active``
+    run at once, so restoring or adding many rows never starts hundreds of
+    animations together. An item whose ``visible`` callback says it is
+    off-screen when its turn comes is simply finished. With reduced motion
+    every animation jumps straight to its end value.
+    """
+
+    FRAME_MS = 16
+
+    def __init__(self, parent=None, reduced_motion=REDUCED_MOTION):
+        super().__init__(parent)
+        self.reduced_motion = reduced_motion
+        self.stagger_ms = 40
+        self.max_active = 6
+        self._queue = []
+        self._active = []
+        self._seq = 0
+        self._next_start = 0
+        self._clock = QElapsedTimer()
+        self._clock.start()
+        self._timer = QTimer(self)
+        self._timer.setInterval(self.FRAME_MS)
+        self._timer.timeout.connect(self._tick)
+
+    def schedule(self, step, duration=600, easing=QEasingCurve.OutBack, delay=100,
+                 visible=None, stagger=True, group=None):
+        """Call ``step(value)`` each frame with the eased value 0..1.
+
+        Unstaggered items start after ``delay`` regardless of the queue and
+        do not count against ``max_active``.
+        """
+        if self.reduced_motion:
+            step(1.0)
+            return
+        now = self._clock.elapsed()
+        start = now + delay
+        if stagger:
+            start = max(start, self._next_start)
+            self._next_start = start + self.stagger_ms
+        self._seq += 1
+        heapq.heappush(self._queue, (start, self._seq, step, duration,
+                                     QEasingCurve(easing), visible, stagger, group))
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def cancel(self, group):
+        """Drop pending and running animations of ``group`` without finishing them."""
+        self._queue = [item for item in self._queue if item[7] is not group]
+        heapq.heapify(self._queue)
+        self._active = [item for item in self._active if item[5] is not group]
+
+    def _tick(self):
+        now = self._clock.elapsed()
+        capped = sum(1 for item in self._active if item[4])
+        while self._queue and self._queue[0][0] <= now:
+            if self._queue[0][6] and capped >= self.max_active:
+                break
+            _, _, step, duration, easing, visible, stagger, group = heapq.heappop(self._queue)
+            if visible is not None and not visible():
+                step(1.0)
+                continue
+            capped += stagger
+            self._active.append((now, step, duration, easing, stagger, group))
+
+        running = []
+        for item in self._active:
+            start, step, duration, easing = item[:4]
+            t = (now - start) / duration
+            if t >= 1:
+                step(1.0)
+            else:
+                step(easing.valueForProgress(t))
+                running.append(item)
+        self._active = running
+
+        if not self._active and not self._queue:
+            self._timer.stop()
+
+###############################################################################
+#                          QUESTION LIST MODEL                                #
+###############################################################################
+# Per-row entry animation progress, 0 (hidden) .. 1 (fully shown)
+RevealRole = Qt.UserRole + 1
+# True for questions brought back by the review queue
+ReviewRole = Qt.UserRole + 2
+# Canonical title and id on autocomplete suggestions
+TitleRole = Qt.UserRole + 3
+ProblemRole = Qt.UserRole + 4
+# Adds bigger than this appear at once; restores animate at most this many rows
+BULK_ANIMATION_LIMIT = 12
+
+
+class QuestionListModel(QAbstractListModel):
+    """Qt view of a ``Tracker``'s questions for today.
+
+    Rows are ``Question`` records owned by the store, so a question costs no
+    widgets; only the rows the view shows are ever painted. The model holds no state
+    of its own beyond entry-animation progress: it forwards edits to the
+    tracker and turns tracker events into Qt model notifications.
+    """
+
+    def __init__(self, scheduler, parent=None):
         super().__init__(parent)
-        self.layout = QHBoxLayout(self)
-        self.checkbox = QCheckBox(text)
-
-        # Increased font size and light text for better contrast on dark backgrounds
-        self.checkbox.setFont(QFont("Segoe UI", 12))
-        self.checkbox.setStyleSheet("""
-            QCheckBox {
-                color: #ecf0f1;  /* Light text for dark background */
-                padding: 5px;
-            }
-            QCheckBox::indicator {
-                width: 24px;
-                height: 24px;
-                border-radius: 12px;
-                border: 2px solid rgba(236, 240, 241, 200);
-                background: rgba(236, 240, 241, 40);
-            }
-            QCheckBox::indicator:checked {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:1,
-                                            stop:0 #8e2de2, stop:1 #4a00e0);
-                border: 2px solid #4a00e0;
-            }
-            QCheckBox:hover {
-                background: rgba(236, 240, 241, 15);
-                border-radius: 10px;
-            }
-        """)
-
-        self.layout.addWidget(self.checkbox)
-        self.layout.setContentsMargins(5, 5, 5, 5)
+        self.tracker = None
+        self.scheduler = scheduler
+        # Set by the view's owner; entries for rows it reports hidden are skipped
+        self.row_visible = None
+        self._reveal = {}
+        self._animate_added = False
+
+    def setTracker(self, tracker):
+        self.beginResetModel()
+        if self.tracker is not None:
+            self.tracker.unsubscribe(self._onTrackerEvent)
+        self.tracker = tracker
+        tracker.subscribe(self._onTrackerEvent)
+        self._stopEntries()
+        # Only the head of a restored list can be on screen at startup
+        restored = range(min(tracker.total, BULK_ANIMATION_LIMIT))
+        for row in restored:
+            self._reveal[row] = 0.0
+        self.endResetModel()
+        for row in restored:
+            self.animateEntry(row)
+
+    def detach(self):
+        # The view is going away but the tracker stays
+        if self.tracker is not None:
+            self.tracker.unsubscribe(self._onTrackerEvent)
+            self.tracker = None
 
+    def rows(self):
+        return self.tracker.questions if self.tracker is not None else []
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.rows())
+
+    def flags(self, index):
+        return Qt.ItemIsEnabled | Qt.ItemIsUserCheckable
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        q = self.rows()[index.row()]
+        if role == Qt.DisplayRole:
+            return q.text
+        if role == Qt.CheckStateRole:
+            return Qt.Checked if q.completed else Qt.Unchecked
+        if role == RevealRole:
+            return self._reveal.get(index.row(), 1.0)
+        if role == ReviewRole:
+            return q.review is not None
+        if role == Qt.ToolTipRole and q.problem:
+            return f"Problem #{q.problem}"
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if not index.isValid() or role != Qt.CheckStateRole:
+            return False
+        self.tracker.setCompleted(index.row(), value == Qt.Checked)
+        return True
+
+    def _onTrackerEvent(self, event, *args):
+        if event == 'aboutToAdd':
+            first, last = args
+            self.beginInsertRows(QModelIndex(), first, last)
+            self._animate_added = last - first < BULK_ANIMATION_LIMIT
+            if self._animate_added:
+                for row in range(first, last + 1):
+                    self._reveal[row] = 0.0
+        elif event == 'added':
+            first, last = args
+            self.endInsertRows()
+            if self._animate_added:
+                for row in range(first, last + 1):
+                    self.animateEntry(row)
+        elif event == 'changed':
+            first, last = args
+            self.dataChanged.emit(self.index(first), self.index(last), [Qt.CheckStateRole])
+        elif event == 'aboutToRemove':
+            first, last = args
+            self.beginRemoveRows(QModelIndex(), first, last)
+            self._stopEntries()
+        elif event == 'removed':
+            self.endRemoveRows()
+        elif event == 'aboutToReset':
+            self.beginResetModel()
+            self._stopEntries()
+        elif event == 'reset':
+            self.endResetModel()
+
+    def animateEntry(self, row):
         # Start collapsed; animate expansion for a modern UX feel
-        self.setMaximumHeight(0)
-        self.animation = QPropertyAnimation(self, b"maximumHeight")
-        self.animation.setDuration(600)
-        self.animation.setEasingCurve(QEasingCurve.OutBack)
-        self.animation.setStartValue(0)
-        self.animation.setEndValue(50)
-        QTimer.singleShot(100, self.animation.start)
+        visible = None
+        if self.row_visible is not None:
+            visible = lambda r=row: self.row_visible(r)
+        self.scheduler.schedule(lambda value, r=row: self.setReveal(r, value),
+                                duration=600, easing=QEasingCurve.OutBack,
+                                visible=visible, group=self)
+
+    def setReveal(self, row, value):
+        if value >= 1.0:
+            self._reveal.pop(row, None)
+        else:
+            self._reveal[row] = value
+        index = self.index(row)
+        self.dataChanged.emit(index, index, [RevealRole])
+
+    def _stopEntries(self):
+        # Row numbers are about to change, so running entries just end shown
+        self.scheduler.cancel(self)
+        self._reveal.clear()
+
+
+class QuestionDelegate(QStyledItemDelegate):
+    """Paints a question row: round gradient indicator plus its text."""
+
+    ROW_HEIGHT = 50
+    INDICATOR = 24
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.font = QFont("Segoe UI", 12)
+        self.tag_font = QFont("Segoe UI", 9, QFont.Bold)
+        self.applyTheme(THEMES['purple'])
+
+    def applyTheme(self, colors):
+        self.text_color = QColor(colors['text'])
+        self.hover_color = QColor(colors['row_hover'])
+        self.border_color = QColor(colors['indicator_border'])
+        self.fill_color = QColor(colors['indicator_fill'])
+        self.checked_border = QPen(QColor(colors['accent_dark']), 2)
+        # Object-bounding gradient, so one brush fits every indicator
+        gradient = QLinearGradient(0, 0, 1, 1)
+        gradient.setCoordinateMode(QGradient.ObjectBoundingMode)
+        gradient.setColorAt(0, QColor(colors['accent']))
+        gradient.setColorAt(1, QColor(colors['accent_dark']))
+        self.checked_brush = QBrush(gradient)
+        self.tag_color = QColor(colors['accent'])
+
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), self.ROW_HEIGHT)
+
+    def paint(self, painter, option, index):
+        reveal = index.data(RevealRole)
+        if reveal <= 0:
+            return
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setOpacity(min(reveal, 1.0))
+        # Slide in from the left as the row reveals (OutBack overshoots a bit)
+        painter.translate(int((reveal - 1.0) * 30), 0)
+
+        rect = option.rect.adjusted(5, 3, -5, -3)
+        if option.state & QStyle.State_MouseOver:
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(self.hover_color)
+            painter.drawRoundedRect(rect, 10, 10)
+
+        size = self.INDICATOR
+        box = QRect(rect.left() + 10, rect.center().y() - size // 2, size, size)
+        if index.data(Qt.CheckStateRole) == Qt.Checked:
+            painter.setPen(self.checked_border)
+            painter.setBrush(self.checked_brush)
+        else:
+            painter.setPen(QPen(self.border_color, 2))
+            painter.setBrush(self.fill_color)
+        painter.drawEllipse(box)
+
+        text_rect = rect.adjusted(size + 22, 0, -5, 0)
+        if index.data(ReviewRole):
+            painter.setFont(self.tag_font)
+            painter.setPen(self.tag_color)
+            tag_width = painter.fontMetrics().horizontalAdvance("REVIEW") + 10
+            painter.drawText(text_rect, Qt.AlignVCenter | Qt.AlignRight, "REVIEW")
+            text_rect.setRight(text_rect.right() - tag_width)
+
+        painter.setFont(self.font)
+        painter.setPen(self.text_color)
+        text = painter.fontMetrics().elidedText(index.data(), Qt.ElideRight, text_rect.width())
+        painter.drawText(text_rect, Qt.AlignVCenter | Qt.AlignLeft, text)
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index):
+        toggle = (
+            (event.type() == QEvent.MouseButtonRelease and event.button() == Qt.LeftButton
+             and option.rect.contains(event.pos()))
+            or (event.type() == QEvent.KeyPress and event.key() in (Qt.Key_Space, Qt.Key_Select))
+        )
+        if not toggle:
+            return False
+        state = index.data(Qt.CheckStateRole)
+        return model.setData(index, Qt.Unchecked if state == Qt.Checked else Qt.Checked,
+                             Qt.CheckStateRole)
 
 ###############################################################################
 #                           BUTTON WITH RIPPLE                                #
 ###############################################################################
 class ButtonWithRipple(QPushButton):
+    """Accent button whose hover fade is painted, not re-styled.
+
+    The look comes from the ``#rippleButton`` rule in the application
+    stylesheet; the animated ``opacity`` only changes the alpha of a dimming
+    layer drawn over the button, so a hover frame costs one repaint.
+    """
+
     def __init__(self, text, parent=None):
         super().__init__(text, parent)
+        self.setObjectName("rippleButton")
         self.setFont(QFont("Segoe UI", 12, QFont.Bold))
         self.setCursor(Qt.PointingHandCursor)
         self._opacity = 0.7
 
-        # Updated button gradient to a modern vibrant purple scheme
-        self.setStyleSheet("""
-            QPushButton {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:1,
-                                            stop:0 #8e2de2, stop:1 #4a00e0);
-                color: white;
-                border: none;
-                border-radius: 10px;
-                padding: 10px 15px;
-                margin-top: 5px;
-            }
-            QPushButton:hover {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:1,
-                                            stop:0 #4a00e0, stop:1 #8e2de2);
-            }
-            QPushButton:pressed {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:1,
-                                            stop:0 #6a00b8, stop:1 #5a00a0);
-            }
-        """)
-
         # Animation for hover in/out effect
+        self._animated = True
         self._animation = QPropertyAnimation(self, b"opacity")
         self._animation.setDuration(200)
         self._animation.setStartValue(0.7)
         self._animation.setEndValue(1.0)
         
+    def setAnimated(self, animated):
+        self._animated = animated
+        
     def enterEvent(self, event):
-        self._animation.setDirection(QPropertyAnimation.Forward)
-        self._animation.start()
+        if self._animated:
+            self._animation.setDirection(QPropertyAnimation.Forward)
+            self._animation.start()
+        else:
+            self.setOpacity(1.0)
         super().enterEvent(event)
         
     def leaveEvent(self, event):
-        self._animation.setDirection(QPropertyAnimation.Backward)
-        self._animation.start()
+        if self._animated:
+            self._animation.setDirection(QPropertyAnimation.Backward)
+            self._animation.start()
+        else:
+            self.setOpacity(0.7)
         super().leaveEvent(event)
         
     def getOpacity(self):
@@ -187,68 +842,222 @@ class ButtonWithRipple(QPushButton):
         
     def setOpacity(self, opacity):
         self._opacity = opacity
-        self.setStyleSheet(f"""
-            QPushButton {{
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:1,
-                                            stop:0 #8e2de2, stop:1 #4a00e0);
-                color: white;
-                border: none;
-                border-radius: 10px;
-                padding: 10px 15px;
-                margin-top: 5px;
-                opacity: {opacity};
-            }}
-            QPushButton:hover {{
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:1,
-                                            stop:0 #4a00e0, stop:1 #8e2de2);
-            }}
-            QPushButton:pressed {{
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:1,
-                                            stop:0 #6a00b8, stop:1 #5a00a0);
-            }}
-        """)
+        self.update()
 
     opacity = pyqtProperty(float, getOpacity, setOpacity)
 
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        dim = 1.0 - self._opacity
+        if dim <= 0:
+            return
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(QColor(0, 0, 0, int(dim * 120)))
+        # Stay inside the stylesheet's margin-top and rounded corners
+        painter.drawRoundedRect(QRectF(self.rect().adjusted(0, 5, 0, 0)), 10, 10)
+
+###############################################################################
+#                                  SEARCH                                     #
+###############################################################################
+# Wait this long after the last keystroke before querying
+SEARCH_DEBOUNCE_MS = 150
+
+
+class SearchSignals(QObject):
+    finished = pyqtSignal(int, list)
+
+
+class SearchTask(QRunnable):
+    """Runs one store query on the thread pool and reports back by signal.
+
+    ``generation`` lets the window drop results that arrive after a newer
+    query has already been started.
+    """
+
+    def __init__(self, store, query, generation):
+        super().__init__()
+        self.store = store
+        self.query = query
+        self.generation = generation
+        self.signals = SearchSignals()
+
+    def run(self):
+        try:
+            # Include whatever the write-behind worker has not written yet
+            self.store.flush()
+            results = self.store.search(self.query)
+        except Exception as e:
+            print(f"Error searching: {e}")
+            results = []
+        self.signals.finished.emit(self.generation, results)
+
+###############################################################################
+#                                 SESSION                                     #
+###############################################################################
+class TrackerSession(QObject):
+    """The data behind the window: tracker, store and their upkeep.
+
+    Owns the write-behind worker and the data-file watch, or the connection
+    to the tracker service when one runs. Tray mode keeps a session alive
+    while it drops the window, and builds the next window on it without
+    reloading anything.
+    """
+
+    # Conflicts, as text, from merging another writer's changes
+    merged = pyqtSignal(list)
+    disconnected = pyqtSignal(str)
+
+    def __init__(self, parent=None, connect=True):
+        super().__init__(parent)
+        # False opens the db directly even when the tracker service runs
+        self.connect = connect
+        self.file_watcher = None
+        self.service_notifier = None
+        self.open()
+
+    def open(self):
+        # With the tracker service running, it owns the data and pushes changes
+        from dsa_service import connectTracker
+        self.tracker = connectTracker() if self.connect else None
+        self.remote = self.tracker is not None
+        self.writer = None
+        if self.remote:
+            self.store = self.tracker.store
+            self.service_notifier = QSocketNotifier(self.tracker.fileno(), QSocketNotifier.Read, self)
+            self.service_notifier.activated.connect(self.pumpService)
+            return
+        try:
+            self.store = openStore()
+        except Exception as e:
+            print(f"Error loading data: {e}")
+            # Keep the session usable; nothing is written to disk
+            self.store = HistoryStore(':memory:')
+        # Disk and sync-client I/O happens on a worker, never on the GUI thread
+        self.writer = WriteBehind(self.store)
+        self.tracker = Tracker(self.store)
+        self.watchDataFile()
+
+    def reopen(self):
+        """Close and load again, e.g. to start a new day."""
+        self.close()
+        self.open()
+
+    def pumpService(self):
+        try:
+            self.tracker.pump()
+        except (OSError, ValueError) as e:
+            # The service went away; keep showing what is on screen
+            self.service_notifier.setEnabled(False)
+            self.disconnected.emit(str(e))
+
+    def watchDataFile(self):
+        # The db sits in a synced folder: pick up the CLI's writes and copies
+        # other machines sync in, merging only what changed
+        if not os.path.exists(self.store.path):
+            return
+        if self.file_watcher is None:
+            self.file_watcher = QFileSystemWatcher(self)
+            self.sync_timer = QTimer(self)
+            self.sync_timer.setSingleShot(True)
+            self.sync_timer.setInterval(SYNC_DEBOUNCE_MS)
+            self.sync_timer.timeout.connect(self.syncFromDisk)
+            self.file_watcher.fileChanged.connect(self.sync_timer.start)
+            # A replaced file drops out of the watch; the folder notices it return
+            self.file_watcher.directoryChanged.connect(self.sync_timer.start)
+        self.file_watcher.addPath(self.store.path)
+        self.file_watcher.addPath(os.path.dirname(os.path.abspath(self.store.path)))
+
+    def syncFromDisk(self):
+        if self.store.path not in self.file_watcher.files() and os.path.exists(self.store.path):
+            self.file_watcher.addPath(self.store.path)
+        try:
+            conflicts = self.tracker.syncFromDisk()
+        except Exception as e:
+            print(f"Error loading data: {e}")
+            return
+        if conflicts:
+            self.merged.emit(conflicts)
+
+    def persist(self, method, *args):
+        # Forward a mutation to the tracker; the store only buffers it and
+        # the write-behind worker takes care of the disk
+        try:
+            getattr(self.tracker, method)(*args)
+        except Exception as e:
+            print(f"Error saving data: {e}")
+
+    def close(self):
+        if self.file_watcher is not None:
+            self.sync_timer.stop()
+            watched = self.file_watcher.files() + self.file_watcher.directories()
+            if watched:
+                self.file_watcher.removePaths(watched)
+        if self.service_notifier is not None:
+            self.service_notifier.setEnabled(False)
+            self.service_notifier.deleteLater()
+            self.service_notifier = None
+        if self.writer is not None:
+            self.writer.stop()
+        self.persist('close')
+
 ###############################################################################
 #                              DSATracker MAIN                               #
 ###############################################################################
 class DSATracker(QMainWindow):
-    def __init__(self):
+    # Emitted from closeEvent, once the window has let go of its session
+    closed = pyqtSignal()
+    
+    def __init__(self, session=None, theme=DEFAULT_THEME, keep_session=False):
         super().__init__()
+        # Tray mode hands in a session that outlives the window
+        self.session = session if session is not None else TrackerSession()
+        self.keep_session = keep_session
+        self.theme = ThemeEngine(QApplication.instance(), self)
+        self.animations = AnimationScheduler(self)
+        self.stats = None
         self.initUI()
-        self.loadData()
+        self.theme.themeChanged.connect(self.applyTheme)
+        self.theme.apply(theme)
         
-        # Fade-in animation for the window (maintaining smooth entry)
+        # Fade-in animation for the window (maintaining smooth entry); it runs
+        # alongside the staggered row entries instead of queueing behind them
         self.setWindowOpacity(0)
-        self.fade_in_animation = QPropertyAnimation(self, b"windowOpacity")
-        self.fade_in_animation.setDuration(1000)
-        self.fade_in_animation.setStartValue(0)
-        self.fade_in_animation.setEndValue(1)
-        self.fade_in_animation.setEasingCurve(QEasingCurve.OutCubic)
-        QTimer.singleShot(100, self.fade_in_animation.start)
+        self.animations.schedule(self.setWindowOpacity, duration=1000,
+                                 easing=QEasingCurve.OutCubic, stagger=False)
         
+        self.loadData()
+    
+    def finishStartup(self):
+        # Runs once the first frame is up; nothing here is needed to draw it
         self.updateDailyQuote()
+        
+        self.stats = StatsEngine(self.tracker)
+        self.heatmap.setStats(self.stats)
+        self.updateStats()
+        
+        # Ctrl+T switches between the built-in themes
+        self.theme_shortcut = QShortcut(QKeySequence("Ctrl+T"), self)
+        self.theme_shortcut.activated.connect(self.theme.cycle)
+    
+    def activate(self):
+        # Another launch asked for the window; bring this one forward instead
+        self.showNormal()
+        self.raise_()
+        self.activateWindow()
     
     def updateDailyQuote(self):
-        today = datetime.now().strftime("%Y-%m-%d")
-        try:
-            if os.path.exists(JSON_PATH):
-                with open(JSON_PATH, 'r') as file:
-                    data = json.load(file)
-                    if data.get('date') == today and 'quote' in data:
-                        self.quote_label.setText(data['quote'])
-                        return
-        except:
-            pass
-        # Pick a new random quote if none for today
-        quote = random.choice(MOTIVATIONAL_QUOTES)
-        self.quote_label.setText(quote)
-        self.saveData()
+        if self.tracker.quote:
+            self.quote_label.setText(self.tracker.quote)
+            return
+        # First start of the day: pick one from the corpus, then the day row keeps it
+        from dsa_quotes import pickQuote
+        self.persist('setQuote', pickQuote(self.tracker.store.date))
     
     def initUI(self):
         self.setWindowTitle("DSA Progress Tracker - Rishabh Shetty")
-        self.setGeometry(100, 100, 800, 600)
+        self.setGeometry(100, 100, 800, 720)
         
         # Main widget and layout
         self.central_widget = QWidget()
@@ -259,38 +1068,40 @@ class DSATracker(QMainWindow):
         self.header_layout = QHBoxLayout()
         self.name_label = QLabel("Rishabh Shetty's DSA Tracker")
         self.name_label.setFont(QFont("Segoe UI", 20, QFont.Bold))
-        self.name_label.setStyleSheet("color: #ecf0f1;")
         self.header_layout.addWidget(self.name_label)
         
+        # Search across every past day; results open in a popup list below
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("Search past questions...")
+        self.search_input.setFont(QFont("Segoe UI", 11))
+        self.search_input.setFixedWidth(220)
+        self.search_input.setClearButtonEnabled(True)
+        self.search_input.setObjectName("searchInput")
+        self.search_input.installEventFilter(self)
+        self.header_layout.addWidget(self.search_input)
+        
         self.date_label = QLabel(datetime.now().strftime("%A, %d %B %Y"))
         self.date_label.setFont(QFont("Segoe UI", 16))
         self.date_label.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
-        self.date_label.setStyleSheet("color: rgba(236, 240, 241, 0.9);")
+        self.date_label.setObjectName("dateLabel")
         self.header_layout.addWidget(self.date_label)
         
         self.main_layout.addLayout(self.header_layout)
         
         # Quote of the day section with a dark, subtle background
         self.quote_frame = QFrame()
-        self.quote_frame.setStyleSheet("""
-            QFrame {
-                background: #34495e;
-                border-radius: 10px;
-                margin: 10px 0px;
-            }
-        """)
+        self.quote_frame.setObjectName("quoteFrame")
         self.quote_layout = QVBoxLayout(self.quote_frame)
         
         self.quote_title = QLabel("Quote of the Day")
         self.quote_title.setFont(QFont("Segoe UI", 14, QFont.Bold))
-        self.quote_title.setStyleSheet("color: #8e2de2;")
+        self.quote_title.setObjectName("quoteTitle")
         self.quote_layout.addWidget(self.quote_title)
         
         self.quote_label = QLabel("Loading today's inspiration...")
         italicFont = QFont("Segoe UI", 12)
         italicFont.setItalic(True)
         self.quote_label.setFont(italicFont)
-        self.quote_label.setStyleSheet("color: #ecf0f1;")
         self.quote_label.setWordWrap(True)
         self.quote_layout.addWidget(self.quote_label)
         
@@ -309,92 +1120,72 @@ class DSATracker(QMainWindow):
         # DSA topic label and input
         self.topic_label = QLabel("Today's DSA Topic")
         self.topic_label.setFont(QFont("Segoe UI", 14, QFont.Bold))
-        self.topic_label.setStyleSheet("color: #ecf0f1;")
         self.left_layout.addWidget(self.topic_label)
         
         self.topic_input = QLineEdit()
         self.topic_input.setPlaceholderText("Enter the topic you're working on...")
         self.topic_input.setFont(QFont("Segoe UI", 12))
-        self.topic_input.setStyleSheet("""
-            QLineEdit {
-                background: #34495e;
-                border: none;
-                border-radius: 10px;
-                padding: 10px;
-                color: #ecf0f1;
-            }
-            QLineEdit:focus {
-                background: #34495e;
-            }
-        """)
         self.left_layout.addWidget(self.topic_input)
         
         # New question label and input
         self.question_label = QLabel("Add New Question")
         self.question_label.setFont(QFont("Segoe UI", 14, QFont.Bold))
-        self.question_label.setStyleSheet("color: #ecf0f1; margin-top: 15px;")
+        self.question_label.setObjectName("questionLabel")
         self.left_layout.addWidget(self.question_label)
         
         self.question_input = QLineEdit()
         self.question_input.setPlaceholderText("Enter a question...")
         self.question_input.setFont(QFont("Segoe UI", 12))
-        self.question_input.setStyleSheet("""
-            QLineEdit {
-                background: #34495e;
-                border: none;
-                border-radius: 10px;
-                padding: 10px;
-                color: #ecf0f1;
-            }
-            QLineEdit:focus {
-                background: #34495e;
-            }
-        """)
         self.left_layout.addWidget(self.question_input)
         
+        # Suggestions from the offline problem catalog; the catalog is only
+        # opened on the first keystroke and the list is refilled per keystroke
+        self.catalog = None
+        self.picked_problem = None
+        self.suggestion_model = QStandardItemModel(self)
+        self.completer = QCompleter(self.suggestion_model, self)
+        self.completer.setCompletionMode(QCompleter.UnfilteredPopupCompletion)
+        self.completer.setCompletionRole(TitleRole)
+        self.completer.popup().setObjectName("suggestions")
+        self.completer.activated[QModelIndex].connect(self.pickProblem)
+        self.question_input.setCompleter(self.completer)
+        self.question_input.textEdited.connect(self.suggestProblems)
+        
         self.add_button = ButtonWithRipple("Add Question")
+        self.add_button.setAnimated(not self.animations.reduced_motion)
         self.add_button.clicked.connect(self.addQuestion)
         self.left_layout.addWidget(self.add_button)
         
         self.questions_label = QLabel("Today's Questions")
         self.questions_label.setFont(QFont("Segoe UI", 14, QFont.Bold))
-        self.questions_label.setStyleSheet("color: #ecf0f1; margin-top: 20px;")
+        self.questions_label.setObjectName("questionsLabel")
         self.left_layout.addWidget(self.questions_label)
         
-        # Scroll area for questions with a dark background to harmonize with the theme
-        self.scroll_area = QScrollArea()
-        self.scroll_area.setWidgetResizable(True)
-        self.scroll_area.setStyleSheet("""
-            QScrollArea {
-                background: #2c3e50;
-                border: none;
-                border-radius: 10px;
-            }
-            QScrollBar:vertical {
-                background: #2c3e50;
-                width: 12px;
-                margin: 0;
-            }
-            QScrollBar::handle:vertical {
-                background: #34495e;
-                min-height: 20px;
-                border-radius: 6px;
-            }
-            QScrollBar::handle:vertical:hover {
-                background: #3b5770;
-            }
-            QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {
-                height: 0;
-            }
-        """)
-        self.scroll_content = QWidget()
-        self.scroll_layout = QVBoxLayout(self.scroll_content)
-        self.scroll_layout.setAlignment(Qt.AlignTop)
-        self.scroll_layout.setSpacing(5)
-        self.scroll_layout.setContentsMargins(10, 10, 10, 10)
-        self.scroll_area.setWidget(self.scroll_content)
-        
-        self.left_layout.addWidget(self.scroll_area)
+        # Question list with a dark background to harmonize with the theme.
+        # Rows are painted by the delegate, so only visible ones cost anything.
+        self.question_model = QuestionListModel(self.animations, self)
+        self.question_model.row_visible = self.isRowVisible
+        self.question_list = QListView()
+        self.question_list.setModel(self.question_model)
+        self.question_delegate = QuestionDelegate(self.question_list)
+        self.question_list.setItemDelegate(self.question_delegate)
+        self.question_list.setUniformItemSizes(True)
+        # Lay rows out a batch at a time, so an insert never relayouts the whole list
+        self.question_list.setLayoutMode(QListView.Batched)
+        self.question_list.setMouseTracking(True)
+        self.question_list.setSelectionMode(QListView.NoSelection)
+        self.question_list.setVerticalScrollMode(QListView.ScrollPerPixel)
+        self.question_list.setContextMenuPolicy(Qt.CustomContextMenu)
+        self.question_list.customContextMenuRequested.connect(self.showQuestionMenu)
+        self.question_list.setObjectName("questionList")
+        # The batched layout grows the scroll range over several event loop
+        # turns, so keeping a new row in view means following the range
+        self.follow_list_end = False
+        scroll_bar = self.question_list.verticalScrollBar()
+        scroll_bar.rangeChanged.connect(self.followListEnd)
+        scroll_bar.valueChanged.connect(self.onListScrolled)
+        
+        self.left_layout.addWidget(self.question_list)
         self.left_layout.setStretch(7, 1)
         
         ############################
@@ -407,64 +1198,231 @@ class DSATracker(QMainWindow):
         self.progress_label = QLabel("Your Progress")
         self.progress_label.setFont(QFont("Segoe UI", 16, QFont.Bold))
         self.progress_label.setAlignment(Qt.AlignCenter)
-        self.progress_label.setStyleSheet("color: #ecf0f1; margin-bottom: 20px;")
+        self.progress_label.setObjectName("progressLabel")
         self.right_layout.addWidget(self.progress_label)
         
         self.progress_bar = CircularProgressBar()
+        self.progress_bar.setAnimated(not self.animations.reduced_motion)
+        self.progress_bar.setMaxFps(MAX_FPS)
         self.right_layout.addWidget(self.progress_bar, alignment=Qt.AlignCenter)
         
         self.count_label = QLabel("0/0 Questions Completed")
         self.count_label.setFont(QFont("Segoe UI", 14))
         self.count_label.setAlignment(Qt.AlignCenter)
-        self.count_label.setStyleSheet("color: #ecf0f1; margin-top: 20px;")
+        self.count_label.setObjectName("countLabel")
         self.right_layout.addWidget(self.count_label)
         
         self.motivation_label = QLabel("Let's get started! You can do this!")
         self.motivation_label.setFont(QFont("Segoe UI", 13, QFont.Bold))
         self.motivation_label.setAlignment(Qt.AlignCenter)
-        self.motivation_label.setStyleSheet("color: #8e2de2; margin-top: 30px;")
+        self.motivation_label.setObjectName("motivationLabel")
         self.right_layout.addWidget(self.motivation_label)
         
+        self.stats_label = QLabel("")
+        self.stats_label.setFont(QFont("Segoe UI", 11))
+        self.stats_label.setAlignment(Qt.AlignCenter)
+        self.stats_label.setObjectName("statsLabel")
+        self.right_layout.addWidget(self.stats_label)
+        
         self.grid_layout.addWidget(self.left_column, 0, 0)
         self.grid_layout.addWidget(self.right_column, 0, 1)
         self.grid_layout.setColumnStretch(0, 3)
         self.grid_layout.setColumnStretch(1, 2)
         
-        # Set main window background to a modern vibrant blue–purple gradient with default light text
-        self.setStyleSheet("""
-            QMainWindow {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:1,
-                                            stop:0 #2b5876, stop:1 #4e4376);
-                color: #ecf0f1;
-            }
-        """)
+        # Activity heatmap for the last year, filled in once startup is done
+        self.heatmap = HeatmapWidget()
+        self.main_layout.addWidget(self.heatmap, alignment=Qt.AlignHCenter)
         
-        self.questions = []
-        self.completed_count = 0
+        # Floating results list; a child of the window so it overlays the layout
+        self.search_results = QListWidget(self)
+        self.search_results.setObjectName("searchResults")
+        self.search_results.setFont(QFont("Segoe UI", 11))
+        self.search_results.setFocusPolicy(Qt.NoFocus)
+        self.search_results.hide()
+        self.search_generation = 0
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(SEARCH_DEBOUNCE_MS)
+        self.search_timer.timeout.connect(self.runSearch)
+        self.search_input.textChanged.connect(self.search_timer.start)
         
         # Allow pressing Enter to add a question
         self.question_input.returnPressed.connect(self.addQuestion)
+        self.topic_input.editingFinished.connect(self.saveData)
+    
+    def runSearch(self):
+        query = self.search_input.text().strip()
+        # Bumping the generation discards any query still in flight
+        self.search_generation += 1
+        if not query:
+            self.search_results.hide()
+            return
+        task = SearchTask(self.store, query, self.search_generation)
+        task.signals.finished.connect(self.showSearchResults)
+        QThreadPool.globalInstance().start(task)
+    
+    def showSearchResults(self, generation, results):
+        if generation != self.search_generation:
+            return
+        self.search_results.clear()
+        if not results:
+            self.search_results.addItem("No matching questions")
+        for day, topic, text, completed in results:
+            mark = "\u2713" if completed else "\u2022"
+            item = QListWidgetItem(f"{mark} {text}  \u2014  {day}" + (f" \u00b7 {topic}" if topic else ""))
+            item.setToolTip(text)
+            self.search_results.addItem(item)
+        self.placeSearchResults()
+        self.search_results.show()
+        self.search_results.raise_()
+    
+    def placeSearchResults(self):
+        # Right-aligned under the search box, wide enough for question titles
+        width = 420
+        anchor = self.search_input.mapTo(self, self.search_input.rect().bottomRight())
+        rows = min(self.search_results.count(), 12)
+        height = rows * self.search_results.sizeHintForRow(0) + 16
+        self.search_results.setGeometry(max(0, anchor.x() - width), anchor.y() + 4, width, height)
+    
+    def eventFilter(self, obj, event):
+        if obj is self.search_input:
+            if event.type() == QEvent.KeyPress and event.key() == Qt.Key_Escape:
+                self.search_input.clear()
+                return True
+            if event.type() == QEvent.FocusOut:
+                self.search_results.hide()
+            elif event.type() == QEvent.FocusIn and self.search_input.text().strip():
+                self.runSearch()
+        return super().eventFilter(obj, event)
+    
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        if self.search_results.isVisible():
+            self.placeSearchResults()
+    
+    def isRowVisible(self, row):
+        rect = self.question_list.visualRect(self.question_model.index(row))
+        return rect.isValid() and rect.intersects(self.question_list.viewport().rect())
+    
+    def applyTheme(self, colors):
+        # The stylesheet is already applied app-wide; only painted widgets need telling
+        self.progress_bar.applyTheme(colors)
+        self.question_delegate.applyTheme(colors)
+        self.question_list.viewport().update()
+        self.heatmap.applyTheme(colors)
     
     def addQuestion(self):
         question_text = self.question_input.text().strip()
-        if not question_text:
+        # Enter in the suggestion popup picks a title; the next Enter adds it
+        if not question_text or self.completer.popup().isVisible():
             return
         
-        checkbox_widget = AnimatedCheckBox(question_text)
-        checkbox_widget.checkbox.stateChanged.connect(self.updateProgress)
-        
-        self.scroll_layout.addWidget(checkbox_widget)
-        self.questions.append(checkbox_widget)
+        problem = None
+        if self.picked_problem and self.picked_problem[0] == question_text:
+            problem = self.picked_problem[1]
+        self.picked_problem = None
+        self.persist('addQuestion', question_text, problem)
+        self.saveData()
         
         self.question_input.clear()
         self.question_input.setFocus()
-        
-        self.updateProgress()
-        self.saveData()
+        self.follow_list_end = True
+        self.followListEnd()
+    
+    def followListEnd(self, *args):
+        if self.follow_list_end:
+            scroll_bar = self.question_list.verticalScrollBar()
+            scroll_bar.setValue(scroll_bar.maximum())
+    
+    def onListScrolled(self, value):
+        # Scrolling away from the end stops following it
+        if value != self.question_list.verticalScrollBar().maximum():
+            self.follow_list_end = False
+    
+    def suggestProblems(self, text):
+        if self.catalog is None:
+            from dsa_catalog import Catalog
+            self.catalog = Catalog()
+        try:
+            problems = self.catalog.lookup(text)
+        except Exception as e:
+            print(f"Error reading problem catalog: {e}")
+            problems = []
+        self.suggestion_model.clear()
+        for problem in problems:
+            detail = " · ".join(part for part in (problem.difficulty, problem.tags) if part)
+            item = QStandardItem(f"{problem.title}   {detail}" if detail else problem.title)
+            item.setData(problem.title, TitleRole)
+            item.setData(problem.id, ProblemRole)
+            self.suggestion_model.appendRow(item)
+        if problems:
+            self.completer.complete()
+    
+    def pickProblem(self, index):
+        self.picked_problem = (index.data(TitleRole), index.data(ProblemRole))
+    
+    def addQuestions(self, texts):
+        self.persist('addQuestions', texts)
+    
+    def checkAll(self):
+        self.persist('setAllCompleted', True)
+    
+    def clearCompleted(self):
+        self.persist('removeCompleted')
+    
+    def showQuestionMenu(self, pos):
+        menu = QMenu(self.question_list)
+        menu.addAction("Check all", self.checkAll)
+        menu.addAction("Clear completed", self.clearCompleted)
+        menu.exec_(self.question_list.viewport().mapToGlobal(pos))
+    
+    def batch(self):
+        """Run several mutations with one progress update, animation and save."""
+        return self.tracker.batch()
+    
+    def onTrackerEvent(self, event, *args):
+        if event == 'counts':
+            self.updateProgress()
+        elif event == 'topic' and self.topic_input.text() != args[0]:
+            self.topic_input.setText(args[0])
+        elif event == 'quote':
+            self.quote_label.setText(args[0])
+        elif event == 'day':
+            # After the rest of the new day's events have been applied
+            QTimer.singleShot(0, self.startNewDay)
+        if event in ('counts', 'topic') and self.stats is not None and self.stats.refresh():
+            self.heatmap.updateDay(self.stats.today)
+            self.updateStats()
+    
+    def startNewDay(self):
+        # The service moved on to a new day; yesterday's counts are history now
+        day = datetime.strptime(self.tracker.store.date, "%Y-%m-%d")
+        self.date_label.setText(day.strftime("%A, %d %B %Y"))
+        if self.stats is not None:
+            self.stats = StatsEngine(self.tracker)
+            self.heatmap.setStats(self.stats)
+            self.updateStats()
+    
+    def updateStats(self):
+        stats = self.stats
+        this_week, last_week = stats.weeklyVelocity()
+        lines = [
+            f"Streak: {stats.currentStreak()} day(s) · Best: {stats.longestStreak()}",
+            f"This week: {this_week} solved ({this_week - last_week:+d} vs last week)",
+        ]
+        rates = stats.topicRates()
+        for topic, done, total, rate in rates:
+            if topic == self.tracker.topic:
+                lines.append(f"{topic}: {done}/{total} ({rate:.0%})")
+                break
+        self.stats_label.setText("\n".join(lines))
+        self.stats_label.setToolTip("\n".join(
+            f"{topic}: {done}/{total} ({rate:.0%})" for topic, done, total, rate in rates[:15]
+        ))
     
     def updateProgress(self):
-        total = len(self.questions)
-        completed = sum(1 for q in self.questions if q.checkbox.isChecked())
+        total = self.tracker.total
+        completed = self.tracker.completed_count
         
         self.count_label.setText(f"{completed}/{total} Questions Completed")
         
@@ -482,60 +1440,348 @@ class DSATracker(QMainWindow):
             self.motivation_label.setText("Keep going! You're making progress!")
         else:
             self.motivation_label.setText("Amazing! You've completed all questions!")
-        
-        self.saveData()
     
     def loadData(self):
-        try:
-            if not os.path.exists(JSON_PATH):
-                return
-            with open(JSON_PATH, 'r') as file:
-                data = json.load(file)
-            
-            today = datetime.now().strftime("%Y-%m-%d")
-            if data.get('date') != today:
-                return  # Reset for a new day
-            
-            self.topic_input.setText(data.get('topic', ''))
-            if 'quote' in data:
-                self.quote_label.setText(data['quote'])
-            for q_data in data.get('questions', []):
-                checkbox_widget = AnimatedCheckBox(q_data['text'])
-                checkbox_widget.checkbox.setChecked(q_data.get('completed', False))
-                checkbox_widget.checkbox.stateChanged.connect(self.updateProgress)
-                checkbox_widget.setMaximumHeight(50)
-                self.scroll_layout.addWidget(checkbox_widget)
-                self.questions.append(checkbox_widget)
-            self.updateProgress()
-        except Exception as e:
-            print(f"Error loading data: {e}")
+        self.tracker = self.session.tracker
+        self.store = self.session.store
+        self.tracker.subscribe(self.onTrackerEvent)
+        self.session.merged.connect(self.showMergeConflicts)
+        self.session.disconnected.connect(self.showDisconnected)
+        
+        self.topic_input.setText(self.tracker.topic)
+        self.question_model.setTracker(self.tracker)
+        self.updateProgress()
+    
+    def showMergeConflicts(self, conflicts):
+        self.statusBar().showMessage(
+            f"Merged changes from another copy; {len(conflicts)} conflict(s), kept yours", 15000)
+        self.statusBar().setToolTip("\n".join(conflicts))
+    
+    def showDisconnected(self, reason):
+        self.statusBar().showMessage(f"Lost the tracker service: {reason}")
+    
+    def persist(self, method, *args):
+        self.session.persist(method, *args)
     
     def saveData(self):
-        try:
-            today = datetime.now().strftime("%Y-%m-%d")
-            data = {
-                'date': today,
-                'topic': self.topic_input.text(),
-                'quote': self.quote_label.text(),
-                'questions': [
-                    {
-                        'text': q.checkbox.text(),
-                        'completed': q.checkbox.isChecked()
-                    } for q in self.questions
-                ]
-            }
-            os.makedirs(os.path.dirname(JSON_PATH), exist_ok=True)
-            with open(JSON_PATH, 'w') as file:
-                json.dump(data, file, indent=4)
-        except Exception as e:
-            print(f"Error saving data: {e}")
+        # Questions are stored as they change; only the topic is picked up here
+        self.persist('setTopic', self.topic_input.text())
+    
+    def closeEvent(self, event):
+        self.saveData()
+        QThreadPool.globalInstance().waitForDone()
+        # Let go of the session so a tray-mode session can outlive this window
+        self.tracker.unsubscribe(self.onTrackerEvent)
+        self.question_model.detach()
+        self.session.merged.disconnect(self.showMergeConflicts)
+        self.session.disconnected.disconnect(self.showDisconnected)
+        if self.catalog is not None:
+            self.catalog.close()
+        if not self.keep_session:
+            self.session.close()
+        super().closeEvent(event)
+        self.closed.emit()
+
+###############################################################################
+#                                   TRAY                                      #
+###############################################################################
+# Give the deferred deletes of a closed window time to run before trimming
+TRIM_DELAY_MS = 1000
+
+
+def trayIcon():
+    colors = THEMES.get(DEFAULT_THEME, THEMES['purple'])
+    pixmap = QPixmap(64, 64)
+    pixmap.fill(Qt.transparent)
+    painter = QPainter(pixmap)
+    painter.setRenderHint(QPainter.Antialiasing)
+    painter.setPen(QPen(QColor(colors['accent']), 10))
+    painter.drawEllipse(QRectF(8, 8, 48, 48))
+    painter.end()
+    return QIcon(pixmap)
+
+
+def trimMemory():
+    # Hand the freed widget tree back to the OS instead of keeping it pooled
+    gc.collect()
+    QPixmapCache.clear()
+    import ctypes
+    try:
+        if sys.platform.startswith('linux'):
+            ctypes.CDLL("libc.so.6").malloc_trim(0)
+        elif os.name == 'nt':
+            kernel32 = ctypes.windll.kernel32
+            kernel32.SetProcessWorkingSetSize(kernel32.GetCurrentProcess(), -1, -1)
+    except (OSError, AttributeError):
+        pass
+
+
+class TrayApp(QObject):
+    """Keeps the tracker in the system tray and builds the window on demand.
+
+    Closing the window destroys it, along with its widgets, animations and
+    timers, and the stylesheet is dropped too. Only the ``TrackerSession``
+    stays, and the next window is built on it without reloading. While
+    hidden, the only timer is one very coarse single shot. It wakes for the
+    daily reminder or for midnight, whichever comes first.
+    """
+
+    def __init__(self, app, session=None):
+        super().__init__(app)
+        self.app = app
+        self.session = session if session is not None else TrackerSession(self)
+        self.window = None
+        self.theme = DEFAULT_THEME
+        self.reminded = None
+        self.remind_at = None
+        if REMIND_AT:
+            try:
+                self.remind_at = datetime.strptime(REMIND_AT, "%H:%M").time()
+            except ValueError:
+                print(f"Ignoring DSA_REMIND_AT={REMIND_AT!r}; expected HH:MM")
+        app.setQuitOnLastWindowClosed(False)
+        
+        self.menu = QMenu()
+        self.menu.addAction("Open", self.showWindow)
+        self.menu.addAction("Quit", self.quit)
+        self.icon = QSystemTrayIcon(trayIcon(), self)
+        self.icon.setContextMenu(self.menu)
+        self.icon.activated.connect(self.onActivated)
+        self.icon.show()
+        
+        self.wake_timer = QTimer(self)
+        self.wake_timer.setSingleShot(True)
+        self.wake_timer.setTimerType(Qt.VeryCoarseTimer)
+        self.wake_timer.timeout.connect(self.wake)
+        self.session.tracker.subscribe(self.onTrackerEvent)
+        self.updateToolTip()
+        self.scheduleWake()
+    
+    def onActivated(self, reason):
+        if reason != QSystemTrayIcon.Trigger:
+            return
+        if self.window is not None and self.window.isVisible():
+            self.window.close()
+        else:
+            self.showWindow()
+    
+    def showWindow(self):
+        if self.window is None:
+            self.window = DSATracker(self.session, self.theme, keep_session=True)
+            self.window.setAttribute(Qt.WA_DeleteOnClose)
+            self.window.closed.connect(self.releaseWindow)
+            self.window.theme.themeChanged.connect(self.rememberTheme)
+            self.window.show()
+            self.window.finishStartup()
+        self.window.activate()
+    
+    def rememberTheme(self, colors):
+        self.theme = self.sender().name
+    
+    def releaseWindow(self):
+        self.window = None
+        # The next window applies its theme again
+        self.app.setStyleSheet("")
+        QTimer.singleShot(TRIM_DELAY_MS, trimMemory)
+    
+    def onTrackerEvent(self, event, *args):
+        if event == 'counts':
+            self.updateToolTip()
+        elif event == 'day':
+            # After the rest of the new day's events have been applied
+            QTimer.singleShot(0, self.startNewDay)
+    
+    def updateToolTip(self):
+        tracker = self.session.tracker
+        self.icon.setToolTip(f"DSA Progress: {tracker.completed_count}/{tracker.total} today")
+    
+    def scheduleWake(self):
+        now = datetime.now()
+        # A second past midnight, so a coarse timer cannot wake a little early
+        wake = datetime.combine(now.date() + timedelta(days=1), datetime.min.time()) + timedelta(seconds=1)
+        if self.remind_at is not None:
+            remind = datetime.combine(now.date(), self.remind_at)
+            if remind > now:
+                wake = min(wake, remind)
+        self.wake_timer.start(max(1000, int((wake - now).total_seconds() * 1000)))
+    
+    def wake(self):
+        # Also catches up after the machine slept through the planned time
+        from dsa_store import today_str
+        today = today_str()
+        if today != self.session.store.date:
+            # A service session hears about the new day from the service
+            if not self.session.remote:
+                self.startNewDay(reopen=True)
+        elif (self.remind_at is not None and self.reminded != today
+                and datetime.now().time() >= self.remind_at):
+            self.reminded = today
+            self.remind()
+        self.scheduleWake()
+    
+    def remind(self):
+        tracker = self.session.tracker
+        left = tracker.total - tracker.completed_count
+        if not tracker.total:
+            message = "Nothing on today's list yet."
+        elif left:
+            message = f"{left} question(s) still open today."
+        else:
+            return
+        self.icon.showMessage("DSA Progress", message, QSystemTrayIcon.Information)
+    
+    def startNewDay(self, reopen=False):
+        window = self.window
+        if window is not None:
+            window.close()
+        if reopen:
+            self.session.tracker.unsubscribe(self.onTrackerEvent)
+            self.session.reopen()
+            self.session.tracker.subscribe(self.onTrackerEvent)
+        self.updateToolTip()
+        reviews = sum(1 for q in self.session.tracker.questions if q.review is not None)
+        self.icon.showMessage("DSA Progress", "A new day has started" +
+                              (f"; {reviews} review(s) due." if reviews else "."),
+                              QSystemTrayIcon.Information)
+        if window is not None:
+            self.showWindow()
+    
+    def quit(self):
+        if self.window is not None:
+            self.window.close()
+        self.session.close()
+        self.icon.hide()
+        self.app.quit()
+
+###############################################################################
+#                             INSTRUMENTATION                                 #
+###############################################################################
+# Heartbeat period and how late a beat must be to count as a stall
+HEARTBEAT_MS = 50
+STALL_MS = 50
+OVERLAY_REFRESH_MS = 500
+LOG_INTERVAL_MS = 10000
+
+
+def installInstrumentation(recorder):
+    # Patch at class level before the window exists, so signal connections
+    # made in initUI already point at the timed versions
+    recorder.wrap(DSATracker, 'loadData')
+    recorder.wrap(DSATracker, 'saveData')
+    recorder.wrap(DSATracker, 'updateProgress')
+    recorder.wrap(QuestionListModel, 'setData', 'toggle')
+    recorder.wrap(HistoryStore, 'flush', 'store flush')
+    recorder.wrap(CircularProgressBar, 'paintEvent', 'paint: progress ring')
+    recorder.wrap(HeatmapWidget, 'paintEvent', 'paint: heatmap')
+    recorder.wrap(QuestionDelegate, 'paint', 'paint: question row')
+
+
+class PerfMonitor(QObject):
+    """Event-loop heartbeat plus the periodic histogram log.
+
+    A precise timer fires every ``HEARTBEAT_MS``; any beat arriving more
+    than ``STALL_MS`` late means the GUI thread was busy for that long, and
+    the lateness is recorded as a ``stall``.
+    """
+
+    def __init__(self, recorder, parent=None):
+        super().__init__(parent)
+        self.recorder = recorder
+        self._clock = QElapsedTimer()
+        self._clock.start()
+        self._heartbeat = QTimer(self)
+        self._heartbeat.setTimerType(Qt.PreciseTimer)
+        self._heartbeat.timeout.connect(self._beat)
+        self._heartbeat.start(HEARTBEAT_MS)
+        self._log_timer = QTimer(self)
+        self._log_timer.timeout.connect(recorder.dumpLog)
+        self._log_timer.start(LOG_INTERVAL_MS)
+
+    def _beat(self):
+        late = self._clock.restart() - HEARTBEAT_MS
+        if late > STALL_MS:
+            self.recorder.record('stall', late)
+
+    def stop(self):
+        self._heartbeat.stop()
+        self._log_timer.stop()
+        self.recorder.dumpLog()
+
+
+class PerfOverlay(QLabel):
+    """Per-operation p50/p95/max drawn over the window; Ctrl+Shift+D toggles."""
+
+    def __init__(self, recorder, window):
+        super().__init__(window)
+        self.recorder = recorder
+        self.setObjectName("perfOverlay")
+        self.setFont(QFont("Consolas", 9))
+        self.setAttribute(Qt.WA_TransparentForMouseEvents)
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self.refresh)
+        self._timer.start(OVERLAY_REFRESH_MS)
+        self._shortcut = QShortcut(QKeySequence("Ctrl+Shift+D"), window)
+        self._shortcut.activated.connect(lambda: self.setVisible(not self.isVisible()))
+        self.refresh()
+
+    def refresh(self):
+        if not self.isVisible():
+            return
+        lines = [f"{'operation':<22}{'n':>6}{'p50':>8}{'p95':>8}{'max':>8}"]
+        for name, n, p50, p95, worst in self.recorder.snapshot():
+            lines.append(f"{name[:21]:<22}{n:>6}{p50:>8.2f}{p95:>8.2f}{worst:>8.1f}")
+        self.setText("\n".join(lines))
+        self.adjustSize()
+        self.move(8, self.parentWidget().height() - self.height() - 8)
+        self.raise_()
+
+
+def traceStartup(phase):
+    if TRACE_STARTUP:
+        print(f"[startup] {phase}: {(time.perf_counter() - _START) * 1000:.1f} ms")
+
 
 # Main application entry point
-if __name__ == '__main__':
-    app = QApplication(sys.argv)
+def main():
+    from dsa_instance import InstanceServer
+    traceStartup("imports")
+    
+    from dsa_perf import INSTRUMENT, LOG_PATH, Recorder
+    argv = [arg for arg in sys.argv if arg not in ("--instrument", "--tray")]
+    recorder = None
+    if INSTRUMENT or "--instrument" in sys.argv:
+        from dsa_core import DB_PATH
+        recorder = Recorder(LOG_PATH or os.path.join(os.path.dirname(DB_PATH), "dsa_perf.log"))
+        installInstrumentation(recorder)
+    
+    app = QApplication(argv)
     app.setFont(QFont("Segoe UI", 10))
+    instance = InstanceServer(app)
+    
+    if (TRAY_MODE or "--tray" in sys.argv) and QSystemTrayIcon.isSystemTrayAvailable():
+        # No window until the tray icon is clicked or the app is launched again
+        tray = TrayApp(app)
+        instance.messageReceived.connect(lambda message: tray.showWindow())
+        if recorder is not None:
+            monitor = PerfMonitor(recorder, tray)
+            app.aboutToQuit.connect(monitor.stop)
+        traceStartup("tray ready")
+        return app.exec_()
     
     window = DSATracker()
+    traceStartup("window built")
+    if recorder is not None:
+        monitor = PerfMonitor(recorder, window)
+        window.perf_overlay = PerfOverlay(recorder, window)
+        app.aboutToQuit.connect(monitor.stop)
+    instance.messageReceived.connect(lambda message: window.activate())
+    
     window.show()
+    QTimer.singleShot(0, window.finishStartup)
+    QTimer.singleShot(0, lambda: traceStartup("first frame"))
     
-    sys.exit(app.exec_())
+    return app.exec_()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
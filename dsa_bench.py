@@ -0,0 +1,246 @@
+"""Headless benchmarks for the tracker's hot paths.
+
+    python dsa_bench.py                          (10, 1k and 50k questions)
+    python dsa_bench.py --sizes 10 1000 --repeat 100 --output bench.json
+    python dsa_bench.py --compare old.json       (diff p50/p95 against a saved run)
+
+Each size gets a freshly generated history db. For every operation the
+report has latency percentiles, the peak Python heap it allocated and, for
+the ones that write, bytes written per byte of user data (write
+amplification, Linux only). Writes are flushed synchronously after each
+call so the numbers do not depend on the write-behind timer.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# Must be set before dsa is imported
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+os.environ.setdefault("DSA_REDUCED_MOTION", "1")
+
+DEFAULT_SIZES = (10, 1000, 50000)
+DEFAULT_REPEAT = 30
+# Memory is measured in a separate, shorter pass; tracemalloc skews timings
+MEMORY_REPEAT = 3
+
+
+def percentile(samples, q):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(q / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def bytesWritten():
+    """Bytes this process has passed to write(), or None off Linux."""
+    try:
+        with open("/proc/self/io") as f:
+            for line in f:
+                if line.startswith("wchar:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def generate(path, count):
+    """A history db whose current day holds ``count`` questions."""
+    from dsa_store import HistoryStore
+    store = HistoryStore(path)
+    with store.batch():
+        store.setTopic("Benchmarks")
+        for i in range(count):
+            store.addQuestion(f"Synthetic question {i}: two pointers over sorted input")
+            if i % 3 == 0:
+                store.setCompleted(i, True)
+    store.close()
+
+
+class Bench:
+    """Runs the operations against one window opened on one data file."""
+
+    def __init__(self, app, window, repeat):
+        self.app = app
+        self.window = window
+        self.repeat = repeat
+        self.results = {}
+
+    def measure(self, name, op, logical_bytes=0, setup=None):
+        # logical_bytes is how much user data one call changes
+        samples, written, logical = [], 0, 0
+        for i in range(self.repeat):
+            if setup:
+                setup(i)
+            before = bytesWritten()
+            start = time.perf_counter()
+            op(i)
+            samples.append((time.perf_counter() - start) * 1000)
+            self.window.session.store.flush()
+            if before is not None:
+                written += bytesWritten() - before
+                logical += logical_bytes
+        peak = 0
+        for i in range(MEMORY_REPEAT):
+            if setup:
+                setup(i)
+            tracemalloc.start()
+            op(i)
+            peak = max(peak, tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+            self.window.session.store.flush()
+        self.results[name] = {
+            'n': len(samples),
+            'mean_ms': sum(samples) / len(samples),
+            'p50_ms': percentile(samples, 50),
+            'p95_ms': percentile(samples, 95),
+            'p99_ms': percentile(samples, 99),
+            'max_ms': max(samples),
+            'peak_heap_kb': peak / 1024,
+            'bytes_written': written if bytesWritten() is not None else None,
+            'write_amplification': written / logical if logical else None,
+        }
+
+    def run(self):
+        import dsa
+        w = self.window
+        text = "Benchmark question: longest substring without repeating characters"
+        opened = []
+
+        def load(i):
+            # Opening the store, its writer and the file watch is the load;
+            # binding a window to the result is a few attribute copies
+            opened.append(dsa.TrackerSession(connect=False))
+
+        def unload(i):
+            # Close the session the previous iteration opened
+            while opened:
+                opened.pop().close()
+
+        def add(i):
+            w.question_input.setText(f"{text} #{i}")
+            w.addQuestion()
+
+        def save(i):
+            w.topic_input.setText(f"Benchmarks {i}")
+            w.saveData()
+
+        def progress(i):
+            w.updateProgress()
+
+        def paint(i):
+            w.progress_bar.repaint()
+
+        def seek(i):
+            w.progress_bar.setProgress((i % 100) / 100)
+
+        def cold(i):
+            seek(i)
+            w.progress_bar.invalidateCache()
+
+        self.measure('loadData', load, setup=unload)
+        unload(None)
+        self.measure('addQuestion', add, logical_bytes=len(text.encode()) + 4)
+        self.measure('saveData', save, logical_bytes=len("Benchmarks 00".encode()))
+        self.measure('updateProgress', progress)
+        self.measure('paintEvent', paint, setup=seek)
+        self.measure('paintEvent (cold cache)', paint, setup=cold)
+        return self.results
+
+
+def runSize(app, workdir, count, repeat):
+    import dsa
+    import dsa_core
+    path = os.path.join(workdir, f"bench-{count}.db")
+    generate(path, count)
+    dsa_core.DB_PATH = path
+    dsa_core.JSON_PATH = os.path.join(workdir, "missing.json")
+
+    # Never the tracker service: that would benchmark against the real data
+    window = dsa.DSATracker(dsa.TrackerSession(connect=False))
+    window.show()
+    window.finishStartup()
+    app.processEvents()
+    # Without the worker every mutation flushes on the spot
+    window.session.writer.stop()
+    try:
+        return Bench(app, window, repeat).run()
+    finally:
+        window.close()
+        app.processEvents()
+
+
+def compare(current, previous):
+    for size, ops in current['results'].items():
+        for name, row in ops.items():
+            old = previous.get('results', {}).get(size, {}).get(name)
+            if not old:
+                continue
+            for key in ('p50_ms', 'p95_ms'):
+                if old[key]:
+                    change = (row[key] - old[key]) / old[key]
+                    flag = "  <-- slower" if change > 0.10 else ""
+                    print(f"{size:>6} {name:<24} {key} {old[key]:9.3f} -> {row[key]:9.3f} "
+                          f"({change:+.0%}){flag}")
+
+
+def report(results):
+    for size, ops in results.items():
+        print(f"\n{size} questions")
+        print(f"  {'operation':<24} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'peak KiB':>9} {'write amp':>9}")
+        for name, row in ops.items():
+            amp = row['write_amplification']
+            print(f"  {name:<24} {row['p50_ms']:9.3f} {row['p95_ms']:9.3f} {row['p99_ms']:9.3f} "
+                  f"{row['peak_heap_kb']:9.1f} {amp if amp is None else round(amp, 1)!s:>9}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="dsa_bench", description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--output", help="write the results as JSON here")
+    parser.add_argument("--compare", help="JSON from an earlier run to compare against")
+    args = parser.parse_args(argv)
+
+    from PyQt5.QtCore import QT_VERSION_STR
+    from PyQt5.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication(sys.argv)
+
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="dsa-bench-") as workdir:
+        for count in args.sizes:
+            results[str(count)] = runSize(app, workdir, count, args.repeat)
+
+    try:
+        import resource
+        max_rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    except ImportError:
+        max_rss_kb = None
+    current = {
+        'meta': {
+            'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S"),
+            'python': platform.python_version(),
+            'qt': QT_VERSION_STR,
+            'platform': platform.platform(),
+            'repeat': args.repeat,
+            'max_rss_kb': max_rss_kb,
+        },
+        'results': results,
+    }
+    report(results)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(current, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            previous = json.load(f)
+        print()
+        compare(current, previous)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
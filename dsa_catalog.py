@@ -0,0 +1,180 @@
+"""Offline problem catalog with prefix lookup for autocomplete.
+
+    python dsa_catalog.py build problems.csv      (writes CATALOG_PATH)
+    python dsa_catalog.py lookup "two s"
+
+The source is a CSV dump with a header row. It needs ``id`` and ``title``
+columns; ``difficulty`` and ``tags`` are optional. ``build`` turns it into
+a sorted index with one line per word a title can be found by::
+
+    key <TAB> id <TAB> title <TAB> difficulty <TAB> tags
+
+``key`` is the lowercased title starting at that word, so typing "sum"
+finds "Two Sum". ``Catalog`` memory-maps that file on first use and binary
+searches it line by line. Nothing is parsed up front, and a lookup touches
+only the few lines around the match.
+"""
+import argparse
+import csv
+import mmap
+import os
+import sys
+
+from dsa_core import DB_PATH
+
+# Built index of the offline problem dump
+CATALOG_PATH = os.environ.get(
+    "DSA_CATALOG_PATH",
+    os.path.join(os.path.dirname(DB_PATH), "problem_catalog.idx")
+)
+SUGGESTIONS = 10
+
+ID_COLUMNS = ("id", "problem_id", "frontend_id", "questionid")
+TITLE_COLUMNS = ("title", "name", "problem")
+TAG_COLUMNS = ("tags", "topics", "topic_tags", "related_topics")
+
+
+def normalize(text):
+    return " ".join(text.lower().split())
+
+
+class Problem:
+    __slots__ = ('id', 'title', 'difficulty', 'tags')
+
+    def __init__(self, id, title, difficulty='', tags=''):
+        self.id = id
+        self.title = title
+        self.difficulty = difficulty
+        self.tags = tags
+
+
+class Catalog:
+    """Prefix lookups over a built index; opened lazily, read through mmap."""
+
+    def __init__(self, path=CATALOG_PATH):
+        self.path = path
+        self._file = None
+        self._map = None
+
+    def available(self):
+        return os.path.isfile(self.path) and os.path.getsize(self.path) > 0
+
+    def _open(self):
+        if self._map is None:
+            self._file = open(self.path, 'rb')
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._map
+
+    def _lineStart(self, pos):
+        # Back up to the start of the line containing pos
+        return self._map.rfind(b'\n', 0, pos) + 1
+
+    def _bisect(self, key):
+        # First line whose key is >= key
+        data = self._open()
+        lo, hi = 0, len(data)
+        while lo < hi:
+            mid = self._lineStart((lo + hi) // 2)
+            end = data.find(b'\n', mid)
+            end = len(data) if end < 0 else end
+            if data[mid:data.find(b'\t', mid, end)] < key:
+                lo = end + 1
+            else:
+                hi = mid
+        return lo
+
+    def lookup(self, prefix, limit=SUGGESTIONS):
+        """Problems whose title, or a word in it onwards, starts with ``prefix``.
+
+        Titles that start with the prefix come first.
+        """
+        prefix = normalize(prefix)
+        if not prefix or not self.available():
+            return []
+        data = self._open()
+        pos = self._bisect(prefix.encode())
+        leading, inner, seen = [], [], set()
+        # Read a little past the limit so whole-title matches can move ahead
+        while pos < len(data) and len(leading) + len(inner) < limit * 3:
+            end = data.find(b'\n', pos)
+            end = len(data) if end < 0 else end
+            line = data[pos:end].decode()
+            pos = end + 1
+            line_key, problem_id, title, difficulty, tags = line.split('\t')
+            if not line_key.startswith(prefix):
+                break
+            if problem_id in seen:
+                continue
+            seen.add(problem_id)
+            problem = Problem(problem_id, title, difficulty, tags)
+            (leading if normalize(title) == line_key else inner).append(problem)
+        return (leading + inner)[:limit]
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._file.close()
+            self._map = self._file = None
+
+
+def _column(header, names):
+    for name in names:
+        if name in header:
+            return header[name]
+    return None
+
+
+def build(source, path=CATALOG_PATH):
+    """Write the sorted index for a CSV dump; returns how many problems it has."""
+    lines = []
+    count = 0
+    with open(source, newline='', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        header = {name.strip().lower(): i for i, name in enumerate(next(reader))}
+        id_col, title_col = _column(header, ID_COLUMNS), _column(header, TITLE_COLUMNS)
+        difficulty_col, tags_col = header.get("difficulty"), _column(header, TAG_COLUMNS)
+        if id_col is None or title_col is None:
+            raise ValueError(f"{source} needs an id and a title column")
+
+        def cell(row, col):
+            value = row[col] if col is not None and col < len(row) else ''
+            return " ".join(value.replace('\t', ' ').split())
+
+        for row in reader:
+            problem_id, title = cell(row, id_col), cell(row, title_col)
+            if not problem_id or not title:
+                continue
+            count += 1
+            rest = f"{problem_id}\t{title}\t{cell(row, difficulty_col)}\t{cell(row, tags_col)}"
+            words = normalize(title).split()
+            for i in range(len(words)):
+                lines.append(f"{' '.join(words[i:])}\t{rest}")
+    # Byte order, which is what the bisect compares
+    lines.sort(key=lambda line: line.encode())
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8', newline='\n') as f:
+        f.write("\n".join(lines))
+    os.replace(tmp_path, path)
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="dsa_catalog", description="problem catalog for autocomplete")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build_cmd = sub.add_parser("build", help="index a CSV dump of problems")
+    build_cmd.add_argument("source")
+    build_cmd.add_argument("-o", "--output", default=CATALOG_PATH)
+    lookup_cmd = sub.add_parser("lookup", help="show suggestions for a prefix")
+    lookup_cmd.add_argument("prefix")
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        print(f"Indexed {build(args.source, args.output)} problems into {args.output}")
+        return 0
+    for problem in Catalog().lookup(args.prefix):
+        print(f"{problem.id}\t{problem.title}\t{problem.difficulty}\t{problem.tags}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
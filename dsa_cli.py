@@ -0,0 +1,116 @@
+"""Command-line access to the tracker without starting Qt.
+
+    python dsa_cli.py add "Two Sum" "3Sum" [--topic Arrays]
+    python dsa_cli.py done 2            (or: done "Two Sum")
+    python dsa_cli.py list
+    python dsa_cli.py stats
+    python dsa_cli.py search binary tree [topic:graphs]
+
+Only the standard library and the Qt-free core are imported, so a call
+finishes in tens of milliseconds and is safe to use from shell hooks. If
+``dsa_service.py`` is running, the changes go through it.
+"""
+import argparse
+import sys
+
+from dsa_core import Tracker, openStore
+from dsa_service import connectTracker
+from dsa_stats import StatsEngine
+from dsa_store import SEARCH_LIMIT
+
+
+def cmdAdd(tracker, args):
+    with tracker.batch():
+        if args.topic is not None:
+            tracker.setTopic(args.topic)
+        tracker.addQuestions(args.text)
+    return 0
+
+
+def cmdDone(tracker, args):
+    status = 0
+    with tracker.batch():
+        for ref in args.question:
+            index = int(ref) - 1 if ref.isdigit() else tracker.find(ref)
+            if not 0 <= index < tracker.total:
+                print(f"No such question: {ref}", file=sys.stderr)
+                status = 1
+                continue
+            tracker.setCompleted(index, not args.undo)
+    return status
+
+
+def cmdList(tracker, args):
+    if tracker.topic:
+        print(f"Topic: {tracker.topic}")
+    for i, q in enumerate(tracker.questions, 1):
+        mark = 'x' if q.completed else ' '
+        review = "  (review)" if q.review is not None else ""
+        problem = f"  #{q.problem}" if q.problem else ""
+        print(f"[{mark}] {i}. {q.text}{problem}{review}")
+    return 0
+
+
+def cmdStats(tracker, args):
+    print(f"Today: {tracker.completed_count}/{tracker.total} Questions Completed "
+          f"({int(tracker.progress() * 100)}%)")
+    days = solved = total = 0
+    for _, _, day_total, day_completed in tracker.store.iterDays():
+        days += 1
+        total += day_total
+        solved += day_completed
+    print(f"All time: {solved}/{total} over {days} day(s)")
+    print(f"Reviews due: {tracker.store.dueCount()}")
+    stats = StatsEngine(tracker)
+    this_week, last_week = stats.weeklyVelocity()
+    print(f"Streak: {stats.currentStreak()} day(s), best {stats.longestStreak()}")
+    print(f"This week: {this_week} solved ({this_week - last_week:+d} vs last week)")
+    for topic, done, count, rate in stats.topicRates():
+        print(f"  {topic}: {done}/{count} ({rate:.0%})")
+    return 0
+
+
+def cmdSearch(tracker, args):
+    results = tracker.store.search(" ".join(args.query), limit=args.limit)
+    for day, topic, text, completed in results:
+        mark = 'x' if completed else ' '
+        print(f"[{mark}] {day}  {text}" + (f"  ({topic})" if topic else ""))
+    return 0 if results else 1
+
+
+def buildParser():
+    parser = argparse.ArgumentParser(prog="dsa", description="DSA progress tracker")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    add = sub.add_parser("add", help="add questions to today's list")
+    add.add_argument("text", nargs="+")
+    add.add_argument("--topic", help="set today's topic as well")
+    add.set_defaults(func=cmdAdd)
+
+    done = sub.add_parser("done", help="mark questions done by number or text")
+    done.add_argument("question", nargs="+")
+    done.add_argument("--undo", action="store_true", help="mark as not done instead")
+    done.set_defaults(func=cmdDone)
+
+    sub.add_parser("list", help="show today's questions").set_defaults(func=cmdList)
+    sub.add_parser("stats", help="show progress").set_defaults(func=cmdStats)
+
+    search = sub.add_parser("search", help="find questions from any day")
+    search.add_argument("query", nargs="+", help="words to match; topic:name filters by topic")
+    search.add_argument("--limit", type=int, default=SEARCH_LIMIT)
+    search.set_defaults(func=cmdSearch)
+    return parser
+
+
+def main(argv=None):
+    args = buildParser().parse_args(argv)
+    # Go through the tracker service when it runs, so the window sees the change at once
+    tracker = connectTracker() or Tracker(openStore())
+    try:
+        return args.func(tracker, args)
+    finally:
+        tracker.close()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,222 @@
+"""Tracker state and logic with no Qt dependency.
+
+The window, the command-line tool and scripts all drive the same
+``Tracker``; UIs observe it through ``subscribe`` instead of owning state.
+"""
+import os
+from contextlib import contextmanager
+
+from dsa_store import HistoryStore
+from dsa_sync import mergeDay
+
+# Path to the JSON file (only read once, to migrate it into the history db)
+JSON_PATH = os.environ.get(
+    "DSA_JSON_PATH",
+    r"C:\Users\risha\OneDrive\Desktop\Lab Practice\OOPS Lab 2\dsa_progress.json"
+)
+# Path to the SQLite history of every day
+DB_PATH = os.environ.get(
+    "DSA_DB_PATH",
+    os.path.join(os.path.dirname(JSON_PATH), "dsa_history.db")
+)
+
+
+def openStore(path=None):
+    return HistoryStore(path or DB_PATH, legacy_json=JSON_PATH)
+
+
+class Tracker:
+    """Today's questions and progress on top of a store.
+
+    Listeners registered with ``subscribe`` are called as
+    ``listener(event, *args)``. The events are:
+
+    - ``aboutToAdd`` / ``added`` (first, last): rows appended
+    - ``aboutToRemove`` / ``removed`` (first, last): rows dropped by a merge
+    - ``changed`` (first, last): completion changed within that range
+    - ``aboutToReset`` / ``reset``: rows removed or replaced wholesale
+    - ``topic`` (text) and ``quote`` (text)
+    - ``counts``: completed/total changed, once per batch
+
+    ``completed_count`` is maintained from deltas, never by rescanning.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self.completed_count = sum(1 for q in store.questions if q.completed)
+        self._listeners = []
+        self._batch_depth = 0
+        self._counts_pending = False
+
+    @property
+    def questions(self):
+        return self.store.questions
+
+    @property
+    def total(self):
+        return len(self.store.questions)
+
+    @property
+    def topic(self):
+        return self.store.topic
+
+    @property
+    def quote(self):
+        return self.store.quote
+
+    # ------------------------------------------------------------- listeners
+    def subscribe(self, listener):
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener):
+        self._listeners.remove(listener)
+
+    def _emit(self, event, *args):
+        for listener in list(self._listeners):
+            listener(event, *args)
+
+    def _countsChanged(self):
+        if self._batch_depth:
+            self._counts_pending = True
+        else:
+            self._emit('counts')
+
+    @contextmanager
+    def batch(self):
+        """Group mutations into one ``counts`` event and one store hand-off.
+
+        Usage: ``with tracker.batch(): ...``. Nested batches fold into the
+        outermost one.
+        """
+        self._batch_depth += 1
+        try:
+            with self.store.batch():
+                yield self
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth and self._counts_pending:
+                self._counts_pending = False
+                self._emit('counts')
+
+    # ------------------------------------------------------------- mutations
+    def addQuestions(self, texts, problems=None):
+        """Append questions; ``problems`` optionally gives each a catalog id."""
+        items = [(t.strip(), p) for t, p in zip(texts, problems or [None] * len(texts))
+                 if t.strip()]
+        if not items:
+            return
+        first = self.total
+        last = first + len(items) - 1
+        self._emit('aboutToAdd', first, last)
+        with self.store.batch():
+            for text, problem in items:
+                self.store.addQuestion(text, problem=problem)
+        self._emit('added', first, last)
+        self._countsChanged()
+
+    def addQuestion(self, text, problem=None):
+        self.addQuestions([text], [problem])
+
+    def setCompleted(self, index, completed):
+        if self.questions[index].completed == completed:
+            return False
+        self.store.setCompleted(index, completed)
+        self.completed_count += 1 if completed else -1
+        self._emit('changed', index, index)
+        self._countsChanged()
+        return True
+
+    def setAllCompleted(self, completed):
+        changed = [i for i, q in enumerate(self.questions) if q.completed != completed]
+        if not changed:
+            return
+        with self.store.batch():
+            for index in changed:
+                self.store.setCompleted(index, completed)
+        self.completed_count = self.total if completed else 0
+        self._emit('changed', changed[0], changed[-1])
+        self._countsChanged()
+
+    def removeCompleted(self):
+        if not self.completed_count:
+            return
+        self._emit('aboutToReset')
+        self.store.removeCompleted()
+        self.completed_count = 0
+        self._emit('reset')
+        self._countsChanged()
+
+    def setTopic(self, topic):
+        if topic != self.store.topic:
+            self.store.setTopic(topic)
+            self._emit('topic', topic)
+
+    def setQuote(self, quote):
+        if quote != self.store.quote:
+            self.store.setQuote(quote)
+            self._emit('quote', quote)
+
+    # ------------------------------------------------------------------ sync
+    def syncFromDisk(self):
+        """Merge changes another writer made to today's data file.
+
+        Only the rows that differ produce events. Returns the conflicts, as
+        text, where this side's version was kept.
+        """
+        if not self.store.externalChange():
+            return []
+        snapshots = self.store.readDisk()
+        if snapshots is None:
+            return []
+        base, disk = snapshots
+        plan = mergeDay(base, self.questions, self.topic, self.quote, disk)
+        if not plan:
+            return plan.conflicts
+        rows = {id(q): i for i, q in enumerate(self.questions)}
+        with self.batch():
+            changed = [rows[id(q)] for q, _ in plan.complete]
+            self.completed_count += sum(1 if completed else -1 for _, completed in plan.complete)
+            self.store.applyMerge(plan, disk)
+            if changed:
+                self._emit('changed', min(changed), max(changed))
+                self._countsChanged()
+            for field, value in plan.fields.items():
+                self._emit(field, value)
+
+            # Back to front, so earlier row numbers stay valid
+            removed = sorted((rows[id(q)] for q in plan.remove), reverse=True)
+            while removed:
+                last = first = removed.pop(0)
+                while removed and removed[0] == first - 1:
+                    first = removed.pop(0)
+                self.completed_count -= sum(1 for q in self.questions[first:last + 1]
+                                            if q.completed)
+                self._emit('aboutToRemove', first, last)
+                self.store.dropRows(first, last)
+                self._emit('removed', first, last)
+                self._countsChanged()
+
+            if plan.append:
+                first = self.total
+                last = first + len(plan.append) - 1
+                self._emit('aboutToAdd', first, last)
+                self.store.appendRows(plan.append)
+                self.completed_count += sum(1 for _, _, completed in plan.append if completed)
+                self._emit('added', first, last)
+                self._countsChanged()
+        return plan.conflicts
+
+    # --------------------------------------------------------------- queries
+    def find(self, text):
+        """Index of the first question matching ``text`` (case-insensitive), or -1."""
+        needle = text.strip().lower()
+        for i, q in enumerate(self.questions):
+            if q.text.lower() == needle:
+                return i
+        return -1
+
+    def progress(self):
+        return self.completed_count / self.total if self.total else 0.0
+
+    def close(self):
+        self.store.close()
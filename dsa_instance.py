@@ -0,0 +1,48 @@
+"""Single-instance handling over a local socket (a named pipe on Windows).
+
+Only QtCore/QtNetwork are imported here, so a second launch can hand off
+to the running window without loading the widget stack.
+"""
+import getpass
+
+from PyQt5.QtCore import QObject, pyqtSignal
+from PyQt5.QtNetwork import QLocalServer, QLocalSocket
+
+INSTANCE_NAME = f"dsa-tracker-{getpass.getuser()}"
+TIMEOUT_MS = 300
+
+
+def signalRunningInstance(message=b"raise"):
+    """Send ``message`` to a running tracker; True if one received it."""
+    socket = QLocalSocket()
+    socket.connectToServer(INSTANCE_NAME)
+    if not socket.waitForConnected(TIMEOUT_MS):
+        return False
+    socket.write(message)
+    socket.waitForBytesWritten(TIMEOUT_MS)
+    socket.disconnectFromServer()
+    return True
+
+
+class InstanceServer(QObject):
+    """Listens for later launches and emits ``messageReceived`` for each."""
+
+    messageReceived = pyqtSignal(bytes)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._server = QLocalServer(self)
+        self._server.newConnection.connect(self._accept)
+        if not self._server.listen(INSTANCE_NAME):
+            # A crashed instance can leave its socket file behind on Unix
+            QLocalServer.removeServer(INSTANCE_NAME)
+            self._server.listen(INSTANCE_NAME)
+
+    def _accept(self):
+        while self._server.hasPendingConnections():
+            socket = self._server.nextPendingConnection()
+            socket.readyRead.connect(lambda s=socket: self._read(s))
+            socket.disconnected.connect(socket.deleteLater)
+
+    def _read(self, socket):
+        self.messageReceived.emit(bytes(socket.readAll()))
@@ -0,0 +1,135 @@
+"""Opt-in timing of hot paths, kept as per-operation histograms.
+
+Enabled with ``DSA_INSTRUMENT=1`` or ``python dsa.py --instrument``. When
+it is off no method is wrapped and no timer runs, so the normal path pays
+nothing. When on, ``Recorder.wrap`` patches the chosen methods at class
+level before any widget is built.
+
+The log is a rotating file with one JSON line per interval:
+``{"time": ..., "ops": {name: {"n", "mean_ms", "max_ms", "buckets"}}}``
+where ``buckets`` counts samples at or under each ``BUCKETS_MS`` bound and
+the last entry counts everything slower.
+"""
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+INSTRUMENT = os.environ.get("DSA_INSTRUMENT", "") not in ("", "0")
+LOG_PATH = os.environ.get("DSA_INSTRUMENT_LOG", "")
+
+# Histogram bucket upper bounds, roughly doubling from 0.1 ms to 1 s
+BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2, 4, 8, 16, 33, 66, 133, 266, 533, 1000)
+# Recent samples kept per operation for percentiles
+RECENT = 512
+LOG_BYTES = 1_000_000
+LOG_BACKUPS = 3
+
+
+class Histogram:
+    """Log-bucketed latencies plus a window of recent samples."""
+
+    def __init__(self):
+        self.buckets = [0] * (len(BUCKETS_MS) + 1)
+        self.n = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.recent = deque(maxlen=RECENT)
+
+    def add(self, ms):
+        index = 0
+        while index < len(BUCKETS_MS) and ms > BUCKETS_MS[index]:
+            index += 1
+        self.buckets[index] += 1
+        self.n += 1
+        self.total += ms
+        self.max = max(self.max, ms)
+        self.recent.append(ms)
+
+    def percentile(self, q):
+        if not self.recent:
+            return 0.0
+        ordered = sorted(self.recent)
+        return ordered[min(len(ordered) - 1, int(q / 100 * len(ordered)))]
+
+    def summary(self):
+        return {
+            'n': self.n,
+            'mean_ms': round(self.total / self.n, 3) if self.n else 0.0,
+            'max_ms': round(self.max, 3),
+            'buckets': self.buckets,
+        }
+
+
+class Recorder:
+    """Collects timings from any thread; one histogram per operation name.
+
+    ``session`` accumulates for the whole run (the overlay reads it);
+    ``interval`` is written to the log and reset by ``dumpLog``.
+    """
+
+    def __init__(self, log_path=None):
+        self.session = {}
+        self.interval = {}
+        self._lock = threading.Lock()
+        self._log = None
+        if log_path:
+            # Only paid for when instrumenting
+            import logging
+            from logging.handlers import RotatingFileHandler
+            self._log = logging.getLogger("dsa.perf")
+            self._log.propagate = False
+            self._log.setLevel(logging.INFO)
+            self._log.addHandler(RotatingFileHandler(
+                log_path, maxBytes=LOG_BYTES, backupCount=LOG_BACKUPS, encoding="utf-8"
+            ))
+
+    def record(self, name, ms):
+        with self._lock:
+            for table in (self.session, self.interval):
+                table.setdefault(name, Histogram()).add(ms)
+
+    @contextmanager
+    def timed(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, (time.perf_counter() - start) * 1000)
+
+    def wrap(self, cls, method, name=None):
+        """Replace ``cls.method`` with a version that records its duration."""
+        original = getattr(cls, method)
+        name = name or method
+        recorder = self
+
+        @functools.wraps(original)
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                recorder.record(name, (time.perf_counter() - start) * 1000)
+
+        setattr(cls, method, timed)
+
+    def snapshot(self):
+        """[(name, n, p50, p95, max)] for the whole session, slowest first."""
+        with self._lock:
+            rows = [(name, h.n, h.percentile(50), h.percentile(95), h.max)
+                    for name, h in self.session.items()]
+        rows.sort(key=lambda r: r[3], reverse=True)
+        return rows
+
+    def dumpLog(self):
+        with self._lock:
+            interval, self.interval = self.interval, {}
+        if self._log is None or not interval:
+            return
+        self._log.info(json.dumps({
+            'time': time.strftime("%Y-%m-%dT%H:%M:%S"),
+            'ops': {name: h.summary() for name, h in interval.items()},
+        }))
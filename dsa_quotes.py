@@ -0,0 +1,149 @@
+"""Quote of the day from an external corpus, one quote per line.
+
+The corpus can be large (100k+ lines), so it is never parsed. A sidecar
+``<corpus>.idx`` holds the byte offset of every line as packed 64-bit
+integers. Picking quote ``i`` reads 8 bytes from the index and one line from
+the corpus. The index is rebuilt only when the corpus's size or mtime no
+longer matches the ones recorded in its header.
+
+The pick is deterministic by date unless ``DSA_QUOTE_MODE=random``, so
+every machine shows the same quote on the same day. The day record caches
+the choice, so this runs at most once a day. Without a corpus the built-in
+quotes are used.
+
+    python dsa_quotes.py build [corpus]     (optional; done on demand otherwise)
+    python dsa_quotes.py pick [YYYY-MM-DD]
+"""
+import argparse
+import hashlib
+import os
+import random
+import struct
+import sys
+from array import array
+
+from dsa_core import DB_PATH
+
+QUOTES_PATH = os.environ.get(
+    "DSA_QUOTES_PATH",
+    os.path.join(os.path.dirname(DB_PATH), "quotes.txt")
+)
+QUOTE_MODE = os.environ.get("DSA_QUOTE_MODE", "daily")
+
+# magic, corpus size, corpus mtime (ns), line count
+HEADER = struct.Struct("<8sQqQ")
+MAGIC = b"DSAQIDX1"
+OFFSET = struct.Struct("<Q")
+
+# Used when there is no corpus file
+BUILTIN_QUOTES = [
+    "The only way to do great work is to love what you do. - Steve Jobs",
+    "It does not matter how slowly you go as long as you do not stop. - Confucius",
+    "Success is not final, failure is not fatal: It is the courage to continue that counts. - Winston Churchill",
+    "The future belongs to those who believe in the beauty of their dreams. - Eleanor Roosevelt",
+    "Don't watch the clock; do what it does. Keep going. - Sam Levenson",
+    "The secret of getting ahead is getting started. - Mark Twain",
+    "Believe you can and you're halfway there. - Theodore Roosevelt",
+    "Your time is limited, don't waste it living someone else's life. - Steve Jobs",
+    "It always seems impossible until it's done. - Nelson Mandela",
+    "The best way to predict the future is to create it. - Abraham Lincoln"
+]
+
+
+class QuoteCorpus:
+    """Random access to the lines of a quote file through its offset index."""
+
+    def __init__(self, path=QUOTES_PATH):
+        self.path = path
+        self.index_path = path + ".idx"
+
+    def available(self):
+        return os.path.isfile(self.path)
+
+    def _signature(self):
+        st = os.stat(self.path)
+        return st.st_size, st.st_mtime_ns
+
+    def _readHeader(self):
+        try:
+            with open(self.index_path, 'rb') as f:
+                magic, size, mtime, count = HEADER.unpack(f.read(HEADER.size))
+        except (OSError, struct.error):
+            return None
+        if magic != MAGIC or (size, mtime) != self._signature():
+            return None
+        return count
+
+    def buildIndex(self):
+        """Scan the corpus once and write the offset index; returns the line count."""
+        size, mtime = self._signature()
+        offsets = array('Q')
+        with open(self.path, 'rb') as f:
+            offset = 0
+            for line in f:
+                if line.strip():
+                    offsets.append(offset)
+                offset += len(line)
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, size, mtime, len(offsets)))
+            if sys.byteorder == 'big':
+                offsets.byteswap()
+            offsets.tofile(f)
+        os.replace(tmp_path, self.index_path)
+        return len(offsets)
+
+    def count(self):
+        count = self._readHeader()
+        return self.buildIndex() if count is None else count
+
+    def line(self, i):
+        """The ``i``th non-blank line, read with two seeks."""
+        with open(self.index_path, 'rb') as index:
+            index.seek(HEADER.size + i * OFFSET.size)
+            offset, = OFFSET.unpack(index.read(OFFSET.size))
+        with open(self.path, 'rb') as corpus:
+            corpus.seek(offset)
+            return corpus.readline().decode('utf-8', 'replace').strip()
+
+
+def choose(count, day, mode=QUOTE_MODE):
+    if mode == "random":
+        return random.randrange(count)
+    # Stable across machines and Python runs, unlike hash()
+    return int.from_bytes(hashlib.sha1(day.encode()).digest()[:8], 'big') % count
+
+
+def pickQuote(day, path=QUOTES_PATH, mode=QUOTE_MODE):
+    """The quote for ``day`` (an ISO date) from the corpus, or a built-in one."""
+    corpus = QuoteCorpus(path)
+    if corpus.available():
+        try:
+            count = corpus.count()
+            if count:
+                return corpus.line(choose(count, day, mode))
+        except OSError as e:
+            print(f"Error reading quote corpus: {e}")
+    return BUILTIN_QUOTES[choose(len(BUILTIN_QUOTES), day, mode)]
+
+
+def main(argv=None):
+    from dsa_store import today_str
+    parser = argparse.ArgumentParser(prog="dsa_quotes", description="quote of the day corpus")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build_cmd = sub.add_parser("build", help="index a corpus, one quote per line")
+    build_cmd.add_argument("corpus", nargs="?", default=QUOTES_PATH)
+    pick_cmd = sub.add_parser("pick", help="show the quote for a day")
+    pick_cmd.add_argument("day", nargs="?", default=today_str())
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        corpus = QuoteCorpus(args.corpus)
+        print(f"Indexed {corpus.buildIndex()} quotes into {corpus.index_path}")
+        return 0
+    print(pickQuote(args.day))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,42 @@
+"""SM-2 style spaced repetition for solved questions.
+
+A question becomes a review item the first time it is completed. Grades are
+given when a day is over, from how that day ended. A question completed that
+day is a good recall (``GOOD``). A review item that was put on the list but
+left open is a failed recall (``AGAIN``). Checking and unchecking during the
+day therefore costs nothing.
+
+The store keeps each item's schedule in ``reviews`` with an index on
+``next_due``. The day's queue is one indexed range query, never a scan of
+the history.
+"""
+import os
+from datetime import date, timedelta
+
+# Most review items added to a new day's list, oldest due first
+REVIEW_LIMIT = int(os.environ.get("DSA_REVIEW_LIMIT", "5"))
+
+GOOD = 4
+AGAIN = 2
+MIN_EASINESS = 1.3
+START_EASINESS = 2.5
+
+
+def sm2(easiness, interval, repetitions, quality):
+    """Next (easiness, interval in days, repetitions) after a 0-5 grade."""
+    easiness = max(MIN_EASINESS,
+                   easiness + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
+    if quality < 3:
+        return easiness, 1, 0
+    if repetitions == 0:
+        interval = 1
+    elif repetitions == 1:
+        interval = 6
+    else:
+        interval = round(interval * easiness)
+    return easiness, interval, repetitions + 1
+
+
+def dueAfter(day, interval):
+    """ISO date ``interval`` days after the ISO date ``day``."""
+    return (date.fromisoformat(day) + timedelta(days=interval)).isoformat()
@@ -0,0 +1,533 @@
+"""Optional local service that holds the one tracker every client shares.
+
+    python dsa_service.py            (serve until Ctrl+C)
+
+By default the window and the CLI each open the history db and write it
+themselves. While the service runs, they connect to it instead. The service
+owns the only ``Tracker``, batches writes through ``WriteBehind`` and pushes
+every change to the connected windows. It also still merges what an outside
+writer, such as a sync client, puts into the file.
+
+The protocol is one JSON object per line over a Unix socket. On Windows, or
+when ``DSA_SERVICE_ADDRESS`` is set to ``host:port``, it uses a localhost
+TCP port instead:
+
+    request   {"id": 1, "op": "setCompleted", "args": [0, true]}
+    reply     {"id": 1, "result": true}   or   {"id": 1, "error": "..."}
+    event     {"event": "changed", "args": [0, 0, [true]]}
+
+A client sends ``state`` to get today's list, and from then on it receives
+events. Events carry the changed rows, so a client never reads the db for
+them. The event for a request arrives before that request's reply. At
+midnight the service opens the new day and sends ``day`` (the new date),
+followed by ``reset``, ``topic``, ``quote`` and ``counts`` for it.
+"""
+import getpass
+import json
+import os
+import socket
+import sys
+import tempfile
+from contextlib import contextmanager
+
+from dsa_core import Tracker, openStore
+from dsa_store import SEARCH_LIMIT, Question, WriteBehind, today_str
+
+SERVICE_ADDRESS = os.environ.get(
+    "DSA_SERVICE_ADDRESS",
+    "127.0.0.1:47831" if os.name == 'nt'
+    else os.path.join(tempfile.gettempdir(), f"dsa-tracker-{getpass.getuser()}.sock")
+)
+CONNECT_TIMEOUT = 0.3
+# While a TCP service listens it writes its address here. A refused localhost
+# connect is slow on Windows, so clients only try one when this file names it.
+SERVICE_MARKER = os.path.join(tempfile.gettempdir(), f"dsa-tracker-{getpass.getuser()}.port")
+# How often the service checks the file for outside writers and a new day (seconds)
+SYNC_POLL = 1.0
+# Longest request line; a large batch of questions still fits
+LINE_LIMIT = 1 << 20
+# Clients that stop reading are dropped rather than buffered forever
+MAX_PENDING = 4 << 20
+RECV_SIZE = 65536
+
+MUTATIONS = ('addQuestions', 'setCompleted', 'setAllCompleted', 'removeCompleted',
+             'setTopic', 'setQuote')
+QUERIES = ('search', 'statsSnapshot', 'iterDays', 'iterQuestions', 'dueCount')
+
+
+def parseAddress(address):
+    """``(host, port)`` for ``host:port``, otherwise a socket path."""
+    host, _, port = address.rpartition(':')
+    if host and port.isdigit():
+        return host, int(port)
+    return address
+
+
+def _advertise(address):
+    with open(SERVICE_MARKER, 'w', encoding='utf-8') as f:
+        f.write(address)
+
+
+def _advertised(address):
+    try:
+        with open(SERVICE_MARKER, encoding='utf-8') as f:
+            return f.read() == address
+    except OSError:
+        return False
+
+
+def _withdraw(address):
+    if _advertised(address):
+        try:
+            os.unlink(SERVICE_MARKER)
+        except OSError:
+            pass
+
+
+def _row(q):
+    return [q.text, q.completed, q.review, q.problem]
+
+
+def _question(row):
+    text, completed, review, problem = row
+    return Question(text, completed, review=review, problem=problem)
+
+
+def _encode(message):
+    return json.dumps(message, separators=(',', ':')).encode() + b'\n'
+
+
+###############################################################################
+#                                 SERVICE                                     #
+###############################################################################
+class TrackerService:
+    """Serves one ``Tracker`` to any number of clients on an asyncio loop.
+
+    Requests run on the loop thread one at a time, so the tracker never sees
+    two writers. The disk is written by the ``WriteBehind`` thread.
+    """
+
+    def __init__(self, tracker, writer):
+        self.tracker = tracker
+        self.writer = writer
+        self.subscribers = set()
+        tracker.subscribe(self._onTrackerEvent)
+
+    def _onTrackerEvent(self, event, *args):
+        questions = self.tracker.questions
+        if event == 'added':
+            first, last = args
+            args = [first, last, [_row(q) for q in questions[first:last + 1]]]
+        elif event == 'changed':
+            first, last = args
+            args = [first, last, [q.completed for q in questions[first:last + 1]]]
+        elif event == 'reset':
+            args = [[_row(q) for q in questions]]
+        elif event == 'counts':
+            args = [self.tracker.completed_count]
+        elif event not in ('removed', 'topic', 'quote'):
+            # The aboutTo* halves are implied by the event that follows
+            return
+        self._push(event, args)
+
+    def _push(self, event, args):
+        data = _encode({'event': event, 'args': list(args)})
+        for writer in list(self.subscribers):
+            if writer.transport.get_write_buffer_size() > MAX_PENDING:
+                self.subscribers.discard(writer)
+                writer.close()
+            else:
+                writer.write(data)
+
+    def startNewDay(self):
+        """Close yesterday and open today, then hand clients the new list."""
+        path = self.tracker.store.path
+        self.writer.stop()
+        self.tracker.unsubscribe(self._onTrackerEvent)
+        self.tracker.close()
+        self.tracker = Tracker(openStore(path))
+        self.writer = WriteBehind(self.tracker.store)
+        self.tracker.subscribe(self._onTrackerEvent)
+        state = self.state()
+        self._push('day', [state['date']])
+        self._push('reset', [state['rows']])
+        self._push('topic', [state['topic']])
+        self._push('quote', [state['quote']])
+        self._push('counts', [state['completed']])
+
+    def close(self):
+        self.writer.stop()
+        self.tracker.close()
+
+    def state(self):
+        store = self.tracker.store
+        return {
+            'date': store.date,
+            'path': store.path,
+            'topic': self.tracker.topic,
+            'quote': self.tracker.quote,
+            'completed': self.tracker.completed_count,
+            'rows': [_row(q) for q in self.tracker.questions],
+        }
+
+    def _call(self, op, args):
+        if op in MUTATIONS:
+            return getattr(self.tracker, op)(*args)
+        if op in QUERIES:
+            # Queries read the db, so it must hold what was just changed
+            self.tracker.store.flush()
+            result = getattr(self.tracker.store, op)(*args)
+            # The iter* queries are generators
+            return result if isinstance(result, (list, tuple, dict, int)) else list(result)
+        if op == 'batch':
+            with self.tracker.batch():
+                return [self._call(name, call_args) for name, call_args in args]
+        raise ValueError(f"Unknown operation: {op}")
+
+    def handle(self, request, writer):
+        """The reply to one request from ``writer``'s client."""
+        if not isinstance(request, dict):
+            return {'id': None, 'error': "A request must be a JSON object"}
+        op = request.get('op')
+        try:
+            if op == 'state':
+                self.subscribers.add(writer)
+                result = self.state()
+            else:
+                result = self._call(op, request.get('args', []))
+        except Exception as e:
+            return {'id': request.get('id'), 'error': f"{type(e).__name__}: {e}"}
+        return {'id': request.get('id'), 'result': result}
+
+    async def _serveClient(self, reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                writer.write(_encode(self.handle(json.loads(line), writer)))
+                await writer.drain()
+        except (ConnectionError, ValueError) as e:
+            print(f"Error serving client: {e}")
+        finally:
+            self.subscribers.discard(writer)
+            writer.close()
+
+    async def _pollDisk(self):
+        import asyncio
+        while True:
+            await asyncio.sleep(SYNC_POLL)
+            try:
+                if today_str() != self.tracker.store.date:
+                    self.startNewDay()
+                conflicts = self.tracker.syncFromDisk()
+            except Exception as e:
+                print(f"Error loading data: {e}")
+                continue
+            for conflict in conflicts:
+                print(f"Merged with conflict: {conflict}")
+
+    async def serve(self, address=SERVICE_ADDRESS):
+        """Run until interrupted; Ctrl+C or SIGTERM stops it cleanly."""
+        # Only the service process pays for asyncio
+        import asyncio
+        import signal
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, stop.set)
+            except (NotImplementedError, RuntimeError):
+                # Windows: Ctrl+C arrives as KeyboardInterrupt instead
+                pass
+        target = parseAddress(address)
+        if isinstance(target, tuple):
+            server = await asyncio.start_server(self._serveClient, *target, limit=LINE_LIMIT)
+            _advertise(address)
+        else:
+            if os.path.exists(target):
+                # Left behind by a service that did not shut down
+                os.unlink(target)
+            server = await asyncio.start_unix_server(self._serveClient, target, limit=LINE_LIMIT)
+        poller = asyncio.ensure_future(self._pollDisk())
+        print(f"Serving {self.tracker.store.path} on {address}")
+        try:
+            async with server:
+                await stop.wait()
+        finally:
+            poller.cancel()
+            for writer in list(self.subscribers):
+                writer.close()
+            if isinstance(target, tuple):
+                _withdraw(address)
+            elif os.path.exists(target):
+                os.unlink(target)
+
+
+###############################################################################
+#                                  CLIENT                                     #
+###############################################################################
+class ServiceClient:
+    """Blocking connection to the service, used from a single thread.
+
+    ``call`` waits for its reply and hands any events that arrive first to
+    ``on_event``. Between calls, ``pump`` delivers pushed events without
+    blocking, which the window does whenever the socket is readable.
+    """
+
+    def __init__(self, sock):
+        self._sock = sock
+        self._buffer = b''
+        self._next_id = 0
+        self.on_event = None
+
+    def fileno(self):
+        return self._sock.fileno()
+
+    def _receive(self, wait):
+        if b'\n' not in self._buffer:
+            self._sock.setblocking(wait)
+            try:
+                data = self._sock.recv(RECV_SIZE)
+            except BlockingIOError:
+                return []
+            if not data:
+                raise ConnectionError("The tracker service closed the connection")
+            self._buffer += data
+        *lines, self._buffer = self._buffer.split(b'\n')
+        return [json.loads(line) for line in lines if line]
+
+    def _dispatch(self, message):
+        if self.on_event is not None:
+            self.on_event(message['event'], *message['args'])
+
+    def call(self, op, *args):
+        self._next_id += 1
+        request_id = self._next_id
+        self._sock.setblocking(True)
+        self._sock.sendall(_encode({'id': request_id, 'op': op, 'args': list(args)}))
+        reply = None
+        while reply is None:
+            for message in self._receive(wait=True):
+                if 'event' in message:
+                    self._dispatch(message)
+                elif message.get('id') == request_id:
+                    reply = message
+        if 'error' in reply:
+            raise RuntimeError(reply['error'])
+        return reply['result']
+
+    def pump(self):
+        """Deliver whatever events have arrived, without blocking."""
+        for message in self._receive(wait=False):
+            if 'event' in message:
+                self._dispatch(message)
+
+    def close(self):
+        self._sock.close()
+
+
+def connect(address=SERVICE_ADDRESS):
+    """A ``ServiceClient`` for the running service, or None if there is none."""
+    target = parseAddress(address)
+    try:
+        if isinstance(target, tuple):
+            if not _advertised(address):
+                return None
+            try:
+                sock = socket.create_connection(target, CONNECT_TIMEOUT)
+            except OSError:
+                # Left behind by a service that did not shut down
+                _withdraw(address)
+                raise
+        else:
+            if not hasattr(socket, 'AF_UNIX') or not os.path.exists(target):
+                return None
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(CONNECT_TIMEOUT)
+            sock.connect(target)
+    except OSError:
+        return None
+    sock.settimeout(None)
+    return ServiceClient(sock)
+
+
+class RemoteStore:
+    """The read-only queries of ``HistoryStore``, answered by the service.
+
+    Each query uses its own short connection, so the window can run them on
+    the thread pool without touching the event connection.
+    """
+
+    def __init__(self, address, date, path):
+        self.address = address
+        self.date = date
+        self.path = path
+
+    def _query(self, op, *args):
+        client = connect(self.address)
+        if client is None:
+            raise ConnectionError("The tracker service is not running")
+        try:
+            return client.call(op, *args)
+        finally:
+            client.close()
+
+    def search(self, query, limit=SEARCH_LIMIT):
+        return self._query('search', query, limit)
+
+    def statsSnapshot(self, date):
+        return self._query('statsSnapshot', date)
+
+    def iterDays(self, since=None, until=None):
+        return iter(self._query('iterDays', since, until))
+
+    def iterQuestions(self, date=None, topic=None):
+        return iter(self._query('iterQuestions', date, topic))
+
+    def dueCount(self, date=None):
+        return self._query('dueCount', date)
+
+    def flush(self):
+        # The service writes on its own schedule
+        pass
+
+    def close(self):
+        pass
+
+
+class RemoteTracker(Tracker):
+    """A ``Tracker`` whose state lives in the service.
+
+    It keeps a mirror of today's list that only the service's events change,
+    and it emits the same events as a local ``Tracker``. UIs therefore work
+    with either one unchanged. Mutations are forwarded, and inside ``batch``
+    they are sent together as one request. It also emits ``day`` (date)
+    when the service moves on to a new day.
+    """
+
+    def __init__(self, client, address=SERVICE_ADDRESS):
+        self.client = client
+        self._listeners = []
+        self._batch_depth = 0
+        self._queued = []
+        state = client.call('state')
+        self.store = RemoteStore(address, state['date'], state['path'])
+        self.store.topic = state['topic']
+        self.store.quote = state['quote']
+        self.store.questions = [_question(row) for row in state['rows']]
+        self.completed_count = state['completed']
+        client.on_event = self._onServiceEvent
+
+    def fileno(self):
+        return self.client.fileno()
+
+    def pump(self):
+        self.client.pump()
+
+    def _onServiceEvent(self, event, *args):
+        store = self.store
+        if event == 'added':
+            first, last, rows = args
+            self._emit('aboutToAdd', first, last)
+            store.questions.extend(_question(row) for row in rows)
+            self._emit('added', first, last)
+        elif event == 'removed':
+            first, last = args
+            self._emit('aboutToRemove', first, last)
+            del store.questions[first:last + 1]
+            self._emit('removed', first, last)
+        elif event == 'changed':
+            first, last, states = args
+            for q, completed in zip(store.questions[first:last + 1], states):
+                q.completed = completed
+            self._emit('changed', first, last)
+        elif event == 'day':
+            # The service moved on to a new day; its list follows as a reset
+            store.date = args[0]
+            self._emit('day', args[0])
+        elif event == 'reset':
+            self._emit('aboutToReset')
+            store.questions = [_question(row) for row in args[0]]
+            self._emit('reset')
+        elif event == 'counts':
+            self.completed_count = args[0]
+            self._emit('counts')
+        elif event in ('topic', 'quote'):
+            setattr(store, event, args[0])
+            self._emit(event, args[0])
+
+    def _send(self, op, *args):
+        if self._batch_depth:
+            self._queued.append([op, list(args)])
+            return None
+        return self.client.call(op, *args)
+
+    @contextmanager
+    def batch(self):
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth and self._queued:
+                queued, self._queued = self._queued, []
+                self.client.call('batch', *queued)
+
+    def addQuestions(self, texts, problems=None):
+        self._send('addQuestions', list(texts), problems)
+
+    def setCompleted(self, index, completed):
+        return self._send('setCompleted', index, completed)
+
+    def setAllCompleted(self, completed):
+        self._send('setAllCompleted', completed)
+
+    def removeCompleted(self):
+        self._send('removeCompleted')
+
+    def setTopic(self, topic):
+        self._send('setTopic', topic)
+
+    def setQuote(self, quote):
+        self._send('setQuote', quote)
+
+    def syncFromDisk(self):
+        # The service merges outside writes and pushes the result
+        return []
+
+    def close(self):
+        self.client.close()
+
+
+def connectTracker(address=SERVICE_ADDRESS):
+    """A ``RemoteTracker`` if the service is running, else None."""
+    client = connect(address)
+    if client is None:
+        return None
+    try:
+        return RemoteTracker(client, address)
+    except (OSError, ValueError, RuntimeError) as e:
+        print(f"Error connecting to tracker service: {e}")
+        client.close()
+        return None
+
+
+def main():
+    import asyncio
+    if connect() is not None:
+        print(f"The tracker service is already running on {SERVICE_ADDRESS}")
+        return 1
+    tracker = Tracker(openStore())
+    service = TrackerService(tracker, WriteBehind(tracker.store))
+    try:
+        asyncio.run(service.serve())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,85 @@
+"""Progress statistics built from the stored per-day and per-topic counters.
+
+Nothing here scans questions: the store keeps ``total``/``completed`` on
+every day and topic, ``StatsEngine`` reads those once and then follows
+today's numbers from the live ``Tracker``, so a toggle costs O(1).
+"""
+from datetime import date, timedelta
+
+
+class StatsEngine:
+    """Streaks, weekly velocity, per-topic rates and per-day counts."""
+
+    def __init__(self, tracker):
+        self.tracker = tracker
+        self.today = date.fromisoformat(tracker.store.date)
+
+        daily, topics, today_row = tracker.store.statsSnapshot(tracker.store.date)
+        # Everything before today is fixed for the session; today is live
+        self._daily = {date.fromisoformat(d): counts for d, counts in daily.items()
+                       if d != tracker.store.date}
+        self._topics = dict(topics)
+        if today_row is not None:
+            topic, total, completed = today_row
+            if topic in self._topics:
+                base_total, base_completed = self._topics[topic]
+                self._topics[topic] = (base_total - total, base_completed - completed)
+
+        self._streak_before, self._longest_before = self._scanStreaks()
+        self._today_counts = None
+        self.refresh()
+
+    def _scanStreaks(self):
+        # One pass over the day counters: the run ending yesterday and the
+        # longest run anywhere before today
+        yesterday = self.today - timedelta(days=1)
+        longest = run = 0
+        previous = None
+        for day in sorted(d for d, (_, completed) in self._daily.items() if completed > 0):
+            run = run + 1 if previous is not None and day - previous == timedelta(days=1) else 1
+            longest = max(longest, run)
+            previous = day
+        streak = run if previous == yesterday else 0
+        return streak, longest
+
+    def refresh(self):
+        """Pick up today's numbers from the tracker; True if they changed."""
+        today = (self.tracker.total, self.tracker.completed_count, self.tracker.topic)
+        changed = today != self._today_counts
+        self._today_counts = today
+        return changed
+
+    # --------------------------------------------------------------- queries
+    def counts(self, day):
+        """(total, completed) for ``day``."""
+        if day == self.today:
+            return self._today_counts[:2]
+        return self._daily.get(day, (0, 0))
+
+    def completedOn(self, day):
+        return self.counts(day)[1]
+
+    def currentStreak(self):
+        # Today not being done yet does not break a running streak
+        return self._streak_before + (1 if self._today_counts[1] > 0 else 0)
+
+    def longestStreak(self):
+        return max(self._longest_before, self.currentStreak())
+
+    def weeklyVelocity(self):
+        """Questions solved in the last 7 days and in the 7 days before."""
+        this_week = sum(self.completedOn(self.today - timedelta(days=i)) for i in range(7))
+        last_week = sum(self.completedOn(self.today - timedelta(days=i)) for i in range(7, 14))
+        return this_week, last_week
+
+    def topicRates(self):
+        """[(topic, completed, total, rate)], most practised topics first."""
+        topics = dict(self._topics)
+        total, completed, topic = self._today_counts
+        if topic:
+            base_total, base_completed = topics.get(topic, (0, 0))
+            topics[topic] = (base_total + total, base_completed + completed)
+        rates = [(name, done, count, done / count)
+                 for name, (count, done) in topics.items() if count > 0]
+        rates.sort(key=lambda r: r[2], reverse=True)
+        return rates
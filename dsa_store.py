@@ -0,0 +1,821 @@
+import json
+import os
+import random
+import sqlite3
+import sys
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+from dsa_review import AGAIN, GOOD, REVIEW_LIMIT, START_EASINESS, dueAfter, sm2
+from dsa_sync import DaySnapshot
+
+# Minimum seconds between two background writes
+SAVE_INTERVAL = 0.5
+
+
+def today_str():
+    return datetime.now().strftime("%Y-%m-%d")
+
+
+###############################################################################
+#                               LEGACY JSON                                   #
+###############################################################################
+def readLegacyJson(json_path):
+    """The day kept by the old JSON snapshot and its journal, read-only.
+
+    Journal records past the snapshot's ``seq`` are replayed in memory; a
+    torn last line from a crash mid-append ends the replay. Neither file is
+    written. Returns (date, topic, quote, [(text, completed)]).
+    """
+    journal_path = os.path.splitext(json_path)[0] + ".journal"
+    date, topic, quote, questions, seq = today_str(), '', None, [], 0
+    if os.path.exists(json_path):
+        with open(json_path, 'r') as file:
+            data = json.load(file)
+        date = data.get('date', date)
+        topic = data.get('topic', '')
+        quote = data.get('quote')
+        questions = [[q['text'], q.get('completed', False)] for q in data.get('questions', [])]
+        seq = data.get('seq', 0)
+    if os.path.exists(journal_path):
+        with open(journal_path, 'r') as file:
+            for line in file:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break
+                if record['seq'] <= seq:
+                    continue
+                op = record['op']
+                if op == 'add':
+                    questions.append([record['text'], False])
+                elif op == 'set':
+                    questions[record['index']][1] = record['completed']
+                elif op == 'topic':
+                    topic = record['topic']
+                elif op == 'quote':
+                    quote = record['quote']
+    return date, topic, quote, [(text, completed) for text, completed in questions]
+
+
+###############################################################################
+#                              HISTORY STORE                                  #
+###############################################################################
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS topics (
+    id        INTEGER PRIMARY KEY,
+    name      TEXT NOT NULL UNIQUE,
+    total     INTEGER NOT NULL DEFAULT 0,
+    completed INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS days (
+    id        INTEGER PRIMARY KEY,
+    date      TEXT NOT NULL UNIQUE,
+    topic_id  INTEGER REFERENCES topics(id),
+    quote     TEXT,
+    total     INTEGER NOT NULL DEFAULT 0,
+    completed INTEGER NOT NULL DEFAULT 0,
+    reviewed  INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS questions (
+    id        INTEGER PRIMARY KEY,
+    day_id    INTEGER NOT NULL REFERENCES days(id),
+    position  INTEGER NOT NULL,
+    text      TEXT NOT NULL,
+    completed INTEGER NOT NULL DEFAULT 0,
+    topic_id  INTEGER REFERENCES topics(id),
+    review_id INTEGER REFERENCES reviews(id),
+    problem_id TEXT,
+    revision  INTEGER NOT NULL DEFAULT 0,
+    parent_revision INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS reviews (
+    id            INTEGER PRIMARY KEY,
+    text          TEXT NOT NULL UNIQUE,
+    topic_id      INTEGER REFERENCES topics(id),
+    easiness      REAL NOT NULL,
+    interval_days INTEGER NOT NULL,
+    repetitions   INTEGER NOT NULL,
+    next_due      TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_questions_day ON questions(day_id, position);
+CREATE INDEX IF NOT EXISTS idx_questions_topic ON questions(topic_id);
+CREATE INDEX IF NOT EXISTS idx_reviews_due ON reviews(next_due);
+CREATE INDEX IF NOT EXISTS idx_days_ungraded ON days(date) WHERE reviewed = 0;
+-- A writer that does not stamp its completion changes still gets a new revision
+CREATE TRIGGER IF NOT EXISTS questions_revision AFTER UPDATE OF completed ON questions
+WHEN new.revision = old.revision BEGIN
+    UPDATE questions SET parent_revision = old.revision, revision = random() WHERE id = new.id;
+END;
+"""
+SCHEMA_VERSION = 5
+
+# Recomputes the per-day and per-topic counters from the questions themselves
+REBUILD_STATS = """
+UPDATE days SET
+    total = (SELECT COUNT(*) FROM questions q WHERE q.day_id = days.id),
+    completed = (SELECT COALESCE(SUM(q.completed), 0) FROM questions q WHERE q.day_id = days.id);
+UPDATE topics SET
+    total = (SELECT COUNT(*) FROM questions q WHERE q.topic_id = topics.id),
+    completed = (SELECT COALESCE(SUM(q.completed), 0) FROM questions q WHERE q.topic_id = topics.id);
+"""
+
+# Full-text index over question text, kept in sync by triggers. Created
+# separately because not every SQLite build ships FTS5.
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE questions_fts USING fts5(
+    text, content='questions', content_rowid='id', tokenize='unicode61'
+);
+CREATE TRIGGER questions_fts_insert AFTER INSERT ON questions BEGIN
+    INSERT INTO questions_fts (rowid, text) VALUES (new.id, new.text);
+END;
+CREATE TRIGGER questions_fts_delete AFTER DELETE ON questions BEGIN
+    INSERT INTO questions_fts (questions_fts, rowid, text) VALUES ('delete', old.id, old.text);
+END;
+CREATE TRIGGER questions_fts_update AFTER UPDATE OF text ON questions BEGIN
+    INSERT INTO questions_fts (questions_fts, rowid, text) VALUES ('delete', old.id, old.text);
+    INSERT INTO questions_fts (rowid, text) VALUES (new.id, new.text);
+END;
+INSERT INTO questions_fts (questions_fts) VALUES ('rebuild');
+"""
+
+SEARCH_LIMIT = 50
+
+# Upgrades from the previous user_version; a fresh db gets SCHEMA directly
+MIGRATIONS = {
+    2: """
+        ALTER TABLE topics ADD COLUMN total INTEGER NOT NULL DEFAULT 0;
+        ALTER TABLE topics ADD COLUMN completed INTEGER NOT NULL DEFAULT 0;
+        ALTER TABLE days ADD COLUMN total INTEGER NOT NULL DEFAULT 0;
+        ALTER TABLE days ADD COLUMN completed INTEGER NOT NULL DEFAULT 0;
+    """ + REBUILD_STATS,
+    # Past days start ungraded, so the first launch seeds the review queue
+    3: """
+        ALTER TABLE days ADD COLUMN reviewed INTEGER NOT NULL DEFAULT 0;
+        ALTER TABLE questions ADD COLUMN review_id INTEGER REFERENCES reviews(id);
+    """,
+    # Canonical id from the problem catalog, when the question was picked from it
+    4: "ALTER TABLE questions ADD COLUMN problem_id TEXT;",
+    # Each write stamps the row, so a merge can tell which write a copy has seen
+    5: """
+        ALTER TABLE questions ADD COLUMN revision INTEGER NOT NULL DEFAULT 0;
+        ALTER TABLE questions ADD COLUMN parent_revision INTEGER NOT NULL DEFAULT 0;
+    """,
+}
+
+TODAY_QUERY = """
+SELECT d.id, t.name, d.quote, q.id, q.position, q.text, q.completed, q.review_id, q.problem_id,
+       q.revision, q.parent_revision
+FROM days d
+LEFT JOIN topics t ON t.id = d.topic_id
+LEFT JOIN questions q ON q.day_id = d.id
+WHERE d.date = ?
+ORDER BY q.position
+"""
+
+
+def newRevision():
+    """A fresh stamp for one write of a question row."""
+    return random.getrandbits(63)
+
+
+class Question:
+    """One of today's questions.
+
+    ``dirty`` means the completion changed since the last flush. A question
+    toggled any number of times between two flushes is written once.
+    """
+
+    __slots__ = ('id', 'text', 'completed', 'review', 'problem', 'dirty')
+
+    def __init__(self, text, completed=False, id=None, review=None, problem=None):
+        self.id = id
+        self.text = text
+        self.completed = completed
+        self.review = review
+        self.problem = problem
+        self.dirty = False
+
+
+class HistoryStore:
+    """Every day's questions kept in SQLite, with today's held in memory.
+
+    Exposes ``questions``, ``topic``, ``quote``, the mutators and
+    ``flush``/``on_dirty``, which is all ``WriteBehind`` needs. Mutations are queued, completion changes are
+    tracked by dirty flags on the ``Question`` records, and both are applied
+    in a single transaction per flush. Past days stay on disk and are only
+    read through the ``iter*`` queries, so history size never affects startup.
+    """
+
+    def __init__(self, path, legacy_json=None):
+        self.path = path
+        self.date = today_str()
+        self.topic = ''
+        self.quote = None
+        self.questions = []
+
+        self.on_dirty = None
+
+        self._day_id = None
+        self._next_position = 0
+        # Questions whose completion is waiting for the next flush
+        self._changed = []
+        # Today as this process last wrote it, and as it last read it; the
+        # latter is the merge base if a sync client replaces the file
+        self._synced = DaySnapshot()
+        self._read_base = DaySnapshot()
+        # {(id, text): {revision: completed}} written since the last read
+        self._written = {}
+        self._file_id = None
+        self._data_version = None
+        self._ops = []
+        self._batch_depth = 0
+        self._lock = threading.Lock()
+        self._io_lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        created = not os.path.exists(path)
+        # Writes come from the write-behind thread; _io_lock serializes access
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._createSchema()
+        if created and legacy_json:
+            migrateJson(self, legacy_json)
+        self.load()
+
+    def _createSchema(self):
+        version = self._db.execute("PRAGMA user_version").fetchone()[0]
+        if version:
+            for target in range(version + 1, SCHEMA_VERSION + 1):
+                self._db.executescript(MIGRATIONS[target])
+        self._db.executescript(SCHEMA)
+        self._db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self._db.commit()
+        self.has_fts = self._ensureFts()
+
+    def _ensureFts(self):
+        exists = self._db.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'questions_fts'").fetchone()
+        if exists:
+            return True
+        try:
+            # Indexes whatever history is already there in the same script
+            self._db.executescript("BEGIN;" + FTS_SCHEMA + "COMMIT;")
+            return True
+        except sqlite3.OperationalError:
+            self._db.rollback()
+            return False
+
+    # ------------------------------------------------------------------ load
+    def load(self):
+        with self._io_lock:
+            self._gradeReviews()
+            rows = self._db.execute(TODAY_QUERY, (self.date,)).fetchall()
+            self._markRead(rows)
+        self.questions = []
+        for day_id, topic, quote, q_id, position, text, completed, review_id, problem, *_ in rows:
+            self._day_id = day_id
+            self.topic = sys.intern(topic or '')
+            self.quote = quote
+            if q_id is not None:
+                self.questions.append(Question(text, bool(completed), q_id, review_id, problem))
+                self._next_position = position + 1
+        if self._day_id is None:
+            # First open of a new day
+            self._queueReviews()
+
+    # --------------------------------------------------------------- reviews
+    def _gradeReviews(self):
+        # Grade every finished day not yet graded (normally just yesterday);
+        # the partial index keeps this from touching graded days at all
+        days = self._db.execute(
+            "SELECT id, date FROM days WHERE reviewed = 0 AND date < ? ORDER BY date",
+            (self.date,)
+        ).fetchall()
+        if not days:
+            return
+        with self._db:
+            for day_id, day in days:
+                rows = self._db.execute(
+                    "SELECT text, completed, review_id, topic_id FROM questions "
+                    "WHERE day_id = ? ORDER BY position", (day_id,)
+                ).fetchall()
+                for text, completed, review_id, topic_id in rows:
+                    if completed:
+                        self._grade(text, topic_id, day, GOOD)
+                    elif review_id is not None:
+                        self._grade(text, topic_id, day, AGAIN)
+                self._db.execute("UPDATE days SET reviewed = 1 WHERE id = ?", (day_id,))
+
+    def _grade(self, text, topic_id, day, quality):
+        row = self._db.execute(
+            "SELECT id, easiness, interval_days, repetitions FROM reviews WHERE text = ?", (text,)
+        ).fetchone()
+        if row is None:
+            easiness, interval, repetitions = sm2(START_EASINESS, 0, 0, quality)
+            self._db.execute(
+                "INSERT INTO reviews (text, topic_id, easiness, interval_days, repetitions, next_due) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (text, topic_id, easiness, interval, repetitions, dueAfter(day, interval))
+            )
+            return
+        review_id, easiness, interval, repetitions = row
+        easiness, interval, repetitions = sm2(easiness, interval, repetitions, quality)
+        self._db.execute(
+            "UPDATE reviews SET easiness = ?, interval_days = ?, repetitions = ?, next_due = ?, "
+            "topic_id = COALESCE(?, topic_id) WHERE id = ?",
+            (easiness, interval, repetitions, dueAfter(day, interval), topic_id, review_id)
+        )
+
+    def _queueReviews(self):
+        with self._io_lock:
+            due = self._db.execute(
+                "SELECT id, text FROM reviews WHERE next_due <= ? ORDER BY next_due LIMIT ?",
+                (self.date, REVIEW_LIMIT)
+            ).fetchall()
+        with self.batch():
+            for review_id, text in due:
+                self.addQuestion(text, review=review_id)
+
+    def dueCount(self, date=None):
+        """How many review items are due on or before ``date`` (default today)."""
+        with self._io_lock:
+            return self._db.execute(
+                "SELECT COUNT(*) FROM reviews WHERE next_due <= ?", (date or self.date,)
+            ).fetchone()[0]
+
+    def _markRead(self, rows):
+        self._synced = DaySnapshot.fromRows(rows)
+        self._read_base = self._synced.copy()
+        self._written = {}
+        self._file_id = self._fileId()
+        self._data_version = self._db.execute("PRAGMA data_version").fetchone()[0]
+
+    def _fileId(self):
+        try:
+            return os.stat(self.path).st_ino
+        except OSError:
+            return None
+
+    # ------------------------------------------------------------------ sync
+    def externalChange(self):
+        """True if another process wrote the file or it was replaced."""
+        with self._io_lock:
+            # data_version only moves for commits made by other connections
+            version = self._db.execute("PRAGMA data_version").fetchone()[0]
+        return version != self._data_version or self._fileId() != self._file_id
+
+    def readDisk(self):
+        """(base, disk) snapshots of today to merge, or None if unreadable.
+
+        Pending writes go out first so that, for the same file, ``disk``
+        already includes them. If the file was swapped for another copy the
+        connection is reopened on the new one, and the base is what was last
+        read. The other copy may or may not hold what this process wrote
+        since, so for those rows its revision stamps decide: a row at one of
+        this process's revisions, or changed once on top of one, has that
+        write as its base. A row both sides wrote without either seeing the
+        other gets no base, so the merge reports it and keeps the local value.
+        """
+        self.flush()
+        with self._io_lock:
+            file_id = self._fileId()
+            if file_id is None:
+                # Mid-replace; the next change notification will retry
+                return None
+            replaced = file_id != self._file_id
+            if replaced:
+                self._db.close()
+                self._db = sqlite3.connect(self.path, check_same_thread=False)
+                self._createSchema()
+            rows = self._db.execute(TODAY_QUERY, (self.date,)).fetchall()
+            base = self._read_base.copy() if replaced else self._synced
+            written = self._written
+            self._markRead(rows)
+            if replaced:
+                for key in self._synced.revisions.keys() & written.keys():
+                    seen = dict(written[key])
+                    if key in base.rows:
+                        seen[base.revisions[key][0]] = base.rows[key]
+                    revision, parent = self._synced.revisions[key]
+                    if revision in seen:
+                        base.rows[key] = seen[revision]
+                    elif parent in seen:
+                        base.rows[key] = seen[parent]
+                    else:
+                        base.rows.pop(key, None)
+        return base, self._synced.copy()
+
+    def applyMerge(self, plan, disk):
+        """Adopt ``plan``'s in-place changes and queue what the disk lacks."""
+        with self._lock:
+            for q, q_id in plan.ids:
+                q.id = q_id
+            for q, completed in plan.complete:
+                q.completed = completed
+            for field, value in plan.fields.items():
+                setattr(self, field, sys.intern(value) if field == 'topic' else value)
+            self._day_id = disk.day_id
+            self._next_position = max(self._next_position, disk.next_position)
+            for q_id, text in plan.write_remove:
+                self._ops.append(('remove', Question(text, id=q_id)))
+            for q in plan.write_add:
+                q.id = None
+                self._ops.append(('add', q, self._next_position))
+                self._next_position += 1
+                if q.completed:
+                    self._markChanged(q)
+            for q in plan.write_set:
+                self._markChanged(q)
+            for field, value in plan.write_fields.items():
+                self._ops.append((field, value))
+        if plan.write_remove or plan.write_add or plan.write_set or plan.write_fields:
+            self._dirty()
+
+    def dropRows(self, first, last):
+        """Forget rows already gone from disk; nothing is written."""
+        with self._lock:
+            del self.questions[first:last + 1]
+
+    def appendRows(self, rows):
+        """Append (id, text, completed) rows already on disk; nothing is written."""
+        with self._lock:
+            self.questions.extend(Question(text, completed, q_id) for q_id, text, completed in rows)
+
+    # ------------------------------------------------------------- mutations
+    def addQuestion(self, text, review=None, problem=None):
+        q = Question(text, review=review, problem=problem)
+        with self._lock:
+            self.questions.append(q)
+            self._ops.append(('add', q, self._next_position))
+            self._next_position += 1
+        self._dirty()
+        return len(self.questions) - 1
+
+    def setCompleted(self, index, completed):
+        q = self.questions[index]
+        if q.completed == completed:
+            return
+        with self._lock:
+            q.completed = completed
+            self._markChanged(q)
+        self._dirty()
+
+    def _markChanged(self, q):
+        # Caller holds _lock
+        if not q.dirty:
+            q.dirty = True
+            self._changed.append(q)
+
+    def removeCompleted(self):
+        """Drop every completed question; returns how many were removed."""
+        with self._lock:
+            removed = [q for q in self.questions if q.completed]
+            if not removed:
+                return 0
+            self.questions[:] = [q for q in self.questions if not q.completed]
+            self._ops.extend(('remove', q) for q in removed)
+        self._dirty()
+        return len(removed)
+
+    def setTopic(self, topic):
+        if topic == self.topic:
+            return
+        with self._lock:
+            self.topic = sys.intern(topic)
+            self._ops.append(('topic', topic))
+        self._dirty()
+
+    def setQuote(self, quote):
+        if quote == self.quote:
+            return
+        with self._lock:
+            self.quote = quote
+            self._ops.append(('quote', quote))
+        self._dirty()
+
+    def _dirty(self):
+        if self._batch_depth:
+            return
+        if self.on_dirty is None:
+            self.flush()
+        else:
+            self.on_dirty()
+
+    @contextmanager
+    def batch(self):
+        """Group mutations so they are handed to the writer only once."""
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth and (self._ops or self._changed):
+                self._dirty()
+
+    # ----------------------------------------------------------------- flush
+    def flush(self):
+        """Apply every queued mutation and changed completion in one transaction."""
+        with self._io_lock:
+            with self._lock:
+                ops, self._ops = self._ops, []
+                changed = [(q, q.completed) for q in self._changed]
+                for q in self._changed:
+                    q.dirty = False
+                self._changed = []
+            if not ops and not changed:
+                return
+            try:
+                with self._db:
+                    for op in ops:
+                        self._execute(op)
+                    # After the ops, so questions added in this flush have ids
+                    for q, completed in changed:
+                        self._writeCompleted(q, completed)
+            except sqlite3.Error:
+                # The transaction rolled back; keep everything for the next flush
+                for op in ops:
+                    if op[0] == 'add':
+                        op[1].id = None
+                with self._lock:
+                    self._ops[:0] = ops
+                    for q, _ in changed:
+                        self._markChanged(q)
+                raise
+
+    def _execute(self, op):
+        # Besides the rows themselves, keeps the total/completed counters on
+        # days and topics in step, so statistics never rescan questions
+        db = self._db
+        kind = op[0]
+        day_id = self._ensureDay()
+        if kind == 'add':
+            q, position = op[1], op[2]
+            revision = newRevision()
+            cur = db.execute(
+                "INSERT INTO questions (day_id, position, text, completed, topic_id, review_id, "
+                "problem_id, revision) "
+                "VALUES (?, ?, ?, 0, (SELECT topic_id FROM days WHERE id = ?), ?, ?, ?)",
+                (day_id, position, q.text, day_id, q.review, q.problem, revision)
+            )
+            q.id = cur.lastrowid
+            self._synced.rows[(q.id, q.text)] = False
+            self._written[(q.id, q.text)] = {revision: False}
+            self._bumpStats(day_id, 1, 0)
+        elif kind == 'remove':
+            q = op[1]
+            row = db.execute("SELECT completed FROM questions WHERE id = ?", (q.id,)).fetchone()
+            if row is not None:
+                db.execute("DELETE FROM questions WHERE id = ?", (q.id,))
+                self._bumpStats(day_id, -1, -row[0])
+            self._synced.rows.pop((q.id, q.text), None)
+            self._written.pop((q.id, q.text), None)
+        elif kind == 'topic':
+            topic_id = self._topicId(op[1])
+            total, completed = db.execute(
+                "SELECT total, completed FROM days WHERE id = ?", (day_id,)).fetchone()
+            self._bumpTopic(day_id, -total, -completed)
+            db.execute("UPDATE days SET topic_id = ? WHERE id = ?", (topic_id, day_id))
+            db.execute("UPDATE questions SET topic_id = ? WHERE day_id = ?", (topic_id, day_id))
+            self._bumpTopic(day_id, total, completed)
+            self._synced.topic = op[1]
+        elif kind == 'quote':
+            db.execute("UPDATE days SET quote = ? WHERE id = ?", (op[1], day_id))
+            self._synced.quote = op[1]
+
+    def _writeCompleted(self, q, completed):
+        # Only counts if the row really changed (it may be gone, or back
+        # where it started after several toggles)
+        revision = newRevision()
+        cur = self._db.execute(
+            "UPDATE questions SET completed = ?, parent_revision = revision, revision = ? "
+            "WHERE id = ? AND completed != ?",
+            (int(completed), revision, q.id, int(completed))
+        )
+        if cur.rowcount:
+            self._bumpStats(self._ensureDay(), 0, 1 if completed else -1)
+            self._written.setdefault((q.id, q.text), {})[revision] = completed
+        if (q.id, q.text) in self._synced.rows:
+            self._synced.rows[(q.id, q.text)] = completed
+
+    def _bumpStats(self, day_id, total, completed):
+        self._db.execute(
+            "UPDATE days SET total = total + ?, completed = completed + ? WHERE id = ?",
+            (total, completed, day_id)
+        )
+        self._bumpTopic(day_id, total, completed)
+
+    def _bumpTopic(self, day_id, total, completed):
+        self._db.execute(
+            "UPDATE topics SET total = total + ?, completed = completed + ? "
+            "WHERE id = (SELECT topic_id FROM days WHERE id = ?)",
+            (total, completed, day_id)
+        )
+
+    def _ensureDay(self):
+        if self._day_id is None:
+            self._day_id = self._insertDay(self.date)
+        return self._day_id
+
+    def _insertDay(self, date, topic='', quote=None):
+        cur = self._db.execute(
+            "INSERT INTO days (date, topic_id, quote) VALUES (?, ?, ?)",
+            (date, self._topicId(topic), quote)
+        )
+        return cur.lastrowid
+
+    def _topicId(self, name):
+        if not name:
+            return None
+        self._db.execute("INSERT OR IGNORE INTO topics (name) VALUES (?)", (name,))
+        return self._db.execute("SELECT id FROM topics WHERE name = ?", (name,)).fetchone()[0]
+
+    # --------------------------------------------------------------- history
+    def iterDays(self, since=None, until=None):
+        """Yield (date, topic, total, completed) per day, oldest first."""
+        query = (
+            "SELECT d.date, t.name, d.total, d.completed "
+            "FROM days d LEFT JOIN topics t ON t.id = d.topic_id "
+            "WHERE d.date >= ? AND d.date <= ? ORDER BY d.date"
+        )
+        yield from self._iter(query, (since or '', until or '9999'))
+
+    def dailyStats(self):
+        """{date: (total, completed)} for every day, from the stored counters."""
+        with self._io_lock:
+            rows = self._db.execute("SELECT date, total, completed FROM days").fetchall()
+        return {date: (total, completed) for date, total, completed in rows}
+
+    def topicStats(self):
+        """{topic: (total, completed)} from the stored counters."""
+        with self._io_lock:
+            rows = self._db.execute("SELECT name, total, completed FROM topics").fetchall()
+        return {name: (total, completed) for name, total, completed in rows}
+
+    def statsSnapshot(self, date):
+        """Consistent (dailyStats, topicStats, (topic, total, completed) of ``date``)."""
+        with self._io_lock:
+            days = self._db.execute("SELECT date, total, completed FROM days").fetchall()
+            topics = self._db.execute("SELECT name, total, completed FROM topics").fetchall()
+            row = self._db.execute(
+                "SELECT t.name, d.total, d.completed FROM days d "
+                "LEFT JOIN topics t ON t.id = d.topic_id WHERE d.date = ?", (date,)
+            ).fetchone()
+        return ({d: (total, completed) for d, total, completed in days},
+                {sys.intern(name): (total, completed) for name, total, completed in topics},
+                row)
+
+    def iterQuestions(self, date=None, topic=None):
+        """Yield (date, topic, text, completed) matching the given filters."""
+        query = (
+            "SELECT d.date, t.name, q.text, q.completed FROM questions q "
+            "JOIN days d ON d.id = q.day_id LEFT JOIN topics t ON t.id = q.topic_id"
+        )
+        clauses, params = [], []
+        if date is not None:
+            clauses.append("d.date = ?")
+            params.append(date)
+        if topic is not None:
+            clauses.append("t.name = ?")
+            params.append(topic)
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY d.date, q.position"
+        yield from self._iter(query, params)
+
+    def search(self, query, limit=SEARCH_LIMIT):
+        """Past questions matching ``query``, best match first.
+
+        Every word is matched as a prefix; ``topic:name`` restricts results to
+        topics starting with ``name``. Returns [(date, topic, text, completed)].
+        """
+        terms, topic = parseQuery(query)
+        if not terms and topic is None:
+            return []
+        clauses, params = [], []
+        if terms and self.has_fts:
+            sql = (
+                "SELECT d.date, t.name, q.text, q.completed FROM questions_fts f "
+                "JOIN questions q ON q.id = f.rowid JOIN days d ON d.id = q.day_id "
+                "LEFT JOIN topics t ON t.id = q.topic_id WHERE questions_fts MATCH ?"
+            )
+            params.append(" ".join('"%s"*' % term.replace('"', '""') for term in terms))
+            order = " ORDER BY bm25(questions_fts), d.date DESC"
+        else:
+            sql = (
+                "SELECT d.date, t.name, q.text, q.completed FROM questions q "
+                "JOIN days d ON d.id = q.day_id LEFT JOIN topics t ON t.id = q.topic_id WHERE 1"
+            )
+            for term in terms:
+                clauses.append("q.text LIKE ? ESCAPE '\\'")
+                params.append('%' + _escapeLike(term) + '%')
+            order = " ORDER BY d.date DESC"
+        if topic is not None:
+            clauses.append("t.name LIKE ? ESCAPE '\\'")
+            params.append(_escapeLike(topic) + '%')
+        for clause in clauses:
+            sql += " AND " + clause
+        sql += order + " LIMIT ?"
+        params.append(limit)
+        with self._io_lock:
+            return self._db.execute(sql, params).fetchall()
+
+    def _iter(self, query, params):
+        # Fetch in pages so a long history is never materialized at once
+        with self._io_lock:
+            cur = self._db.execute(query, params)
+            rows = cur.fetchmany(500)
+        while rows:
+            yield from rows
+            with self._io_lock:
+                rows = cur.fetchmany(500)
+
+    def close(self):
+        self.flush()
+        with self._io_lock:
+            self._db.close()
+
+
+def parseQuery(query):
+    """Split a search string into (words, topic prefix or None)."""
+    terms, topic = [], None
+    for word in query.split():
+        if word.lower().startswith('topic:'):
+            topic = word[len('topic:'):] or None
+        else:
+            terms.append(word)
+    return terms, topic
+
+
+def _escapeLike(text):
+    return text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+def migrateJson(store, json_path):
+    """Import the day kept by the old JSON snapshot/journal into ``store``.
+
+    The legacy files are only read, never rewritten or removed.
+    """
+    journal_path = os.path.splitext(json_path)[0] + ".journal"
+    if not (os.path.exists(json_path) or os.path.exists(journal_path)):
+        return
+    date, topic, quote, questions = readLegacyJson(json_path)
+    with store._io_lock, store._db:
+        day_id = store._insertDay(date, topic, quote)
+        topic_id = store._topicId(topic)
+        store._db.executemany(
+            "INSERT INTO questions (day_id, position, text, completed, topic_id) "
+            "VALUES (?, ?, ?, ?, ?)",
+            [(day_id, i, text, int(completed), topic_id)
+             for i, (text, completed) in enumerate(questions)]
+        )
+    with store._io_lock:
+        store._db.executescript(REBUILD_STATS)
+
+
+###############################################################################
+#                              WRITE BEHIND                                   #
+###############################################################################
+class WriteBehind:
+    """Background thread that flushes a store off the caller's thread.
+
+    ``notify`` only sets a flag, so it is cheap enough to call on every
+    mutation from the GUI thread. The worker coalesces everything that
+    arrives within ``interval`` seconds into one ``flush`` call.
+    """
+
+    def __init__(self, store, interval=SAVE_INTERVAL):
+        self.store = store
+        self.interval = interval
+        self._dirty = threading.Event()
+        self._stopping = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="dsa-write-behind", daemon=True)
+        self.store.on_dirty = self.notify
+        self._thread.start()
+
+    def notify(self):
+        self._dirty.set()
+
+    def _run(self):
+        while not self._stopping.is_set():
+            self._dirty.wait()
+            # Debounce: anything that arrives during the wait rides along
+            self._stopping.wait(self.interval)
+            self._dirty.clear()
+            self._flush()
+
+    def _flush(self):
+        try:
+            self.store.flush()
+        except Exception as e:
+            print(f"Error saving data: {e}")
+
+    def stop(self):
+        """Stop the worker and write out whatever is still buffered."""
+        self._stopping.set()
+        self._dirty.set()
+        self._thread.join()
+        self.store.on_dirty = None
+        self._flush()
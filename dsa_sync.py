@@ -0,0 +1,145 @@
+"""Three-way merge of today's questions when the data file changes underneath.
+
+The history db lives in a synced folder, so it can change while the window
+is open: the CLI writes to it directly, and a sync client can swap in the
+copy another machine wrote. ``mergeDay`` compares three versions of today:
+
+- base: what this process last knew to be on disk
+- local: the in-memory list the window shows
+- disk: what the file holds now
+
+It returns a ``MergePlan`` with the smallest set of changes for each side.
+A change made on only one side is taken as is. A true conflict is the same
+question or field changed differently on both sides, or changed on one side
+and removed on the other. In that case the local version is kept and the
+conflict is reported.
+"""
+
+
+class DaySnapshot:
+    """Today's topic, quote and ``{(id, text): completed}`` in list order.
+
+    ``revisions`` holds each row's ``(revision, parent_revision)`` stamps as
+    read from the db; snapshots built by hand may leave it empty.
+    """
+
+    def __init__(self, topic='', quote=None, rows=None, day_id=None, next_position=0,
+                 revisions=None):
+        self.topic = topic
+        self.quote = quote
+        self.rows = rows if rows is not None else {}
+        self.day_id = day_id
+        self.next_position = next_position
+        self.revisions = revisions if revisions is not None else {}
+
+    @classmethod
+    def fromRows(cls, rows):
+        """Build from ``TODAY_QUERY`` rows."""
+        snapshot = cls()
+        for day_id, topic, quote, q_id, position, text, completed, *_, revision, parent in rows:
+            snapshot.day_id = day_id
+            snapshot.topic = topic or ''
+            snapshot.quote = quote
+            if q_id is not None:
+                snapshot.rows[(q_id, text)] = bool(completed)
+                snapshot.revisions[(q_id, text)] = (revision, parent)
+                snapshot.next_position = position + 1
+        return snapshot
+
+    def copy(self):
+        return DaySnapshot(self.topic, self.quote, dict(self.rows), self.day_id,
+                           self.next_position, dict(self.revisions))
+
+
+class MergePlan:
+    """What to change locally and what to write back, from ``mergeDay``.
+
+    Questions are referred to by their in-memory records, so applying one part
+    never shifts the indexes another part relies on.
+    """
+
+    def __init__(self):
+        self.remove = []        # local records removed on disk
+        self.complete = []      # (record, completed) changed on disk
+        self.append = []        # (id, text, completed) added on disk
+        self.fields = {}        # topic/quote changed on disk
+        self.ids = []           # (record, id): same question under the disk's id
+        self.write_add = []     # local records the disk is missing
+        self.write_set = []     # local records whose completion the disk is missing
+        self.write_remove = []  # (id, text) removed here but still on disk
+        self.write_fields = {}  # topic/quote changed here only
+        self.conflicts = []     # human-readable descriptions
+
+    def __bool__(self):
+        return any((self.remove, self.complete, self.append, self.fields, self.ids,
+                    self.write_add, self.write_set, self.write_remove, self.write_fields))
+
+
+def mergeDay(base, questions, topic, quote, disk):
+    """Plan bringing ``questions``/``topic``/``quote`` and ``disk`` together."""
+    plan = MergePlan()
+    if disk.day_id is None:
+        # A copy that never had today cannot have removed anything from it
+        base = DaySnapshot()
+    unmatched = dict(disk.rows)
+    matches = {}
+    for i, q in enumerate(questions):
+        key = (q.id, q.text)
+        if key in unmatched:
+            matches[i] = key
+            del unmatched[key]
+    # The same question added on another copy of the file gets another id
+    by_text = {}
+    for key in unmatched:
+        by_text.setdefault(key[1], []).append(key)
+    for i, q in enumerate(questions):
+        if i not in matches and by_text.get(q.text):
+            key = by_text[q.text].pop(0)
+            matches[i] = key
+            del unmatched[key]
+
+    for i, q in enumerate(questions):
+        known = base.rows.get((q.id, q.text))
+        key = matches.get(i)
+        if key is None:
+            if known is None:
+                plan.write_add.append(q)
+            elif q.completed != known:
+                plan.conflicts.append(f"'{q.text}' was removed elsewhere but changed here; kept")
+                plan.write_add.append(q)
+            else:
+                plan.remove.append(q)
+            continue
+        if key[0] != q.id:
+            plan.ids.append((q, key[0]))
+        on_disk = disk.rows[key]
+        if on_disk == q.completed:
+            continue
+        if known is None:
+            plan.conflicts.append(f"'{q.text}' is marked differently on both sides; kept this one")
+            plan.write_set.append(q)
+        elif q.completed == known:
+            plan.complete.append((q, on_disk))
+        else:
+            plan.write_set.append(q)
+
+    for key, on_disk in unmatched.items():
+        known = base.rows.get(key)
+        if known is None:
+            plan.append.append((key[0], key[1], on_disk))
+            continue
+        if on_disk != known:
+            plan.conflicts.append(f"'{key[1]}' was changed elsewhere but removed here; stays removed")
+        plan.write_remove.append(key)
+
+    for field, mine in (('topic', topic), ('quote', quote)):
+        theirs, known = getattr(disk, field), getattr(base, field)
+        if mine == theirs:
+            continue
+        if mine == known:
+            plan.fields[field] = theirs
+        else:
+            if theirs != known:
+                plan.conflicts.append(f"The {field} was changed on both sides; kept '{mine}'")
+            plan.write_fields[field] = mine
+    return plan
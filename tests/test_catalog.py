@@ -0,0 +1,26 @@
+from dsa_catalog import Catalog, build
+
+
+def test_prefix_lookup_over_built_index(tmp_path):
+    source = tmp_path / "problems.csv"
+    source.write_text(
+        "id,title,difficulty,tags\n"
+        "1,Two Sum,Easy,array\n"
+        "15,3Sum,Medium,array\n"
+        "167,Two Sum II - Input Array Is Sorted,Medium,array\n"
+        "226,Invert Binary Tree,Easy,tree\n",
+        encoding="utf-8",
+    )
+    path = str(tmp_path / "catalog.idx")
+    assert build(str(source), path) == 4
+    catalog = Catalog(path)
+    assert [p.id for p in catalog.lookup("two s")] == ["1", "167"]
+    # A word inside the title matches too, after titles that start with it
+    assert [p.id for p in catalog.lookup("sum")][:1] == ["1"]
+    assert [p.title for p in catalog.lookup("binary")] == ["Invert Binary Tree"]
+    assert catalog.lookup("zzz") == []
+    catalog.close()
+
+
+def test_missing_catalog_has_no_suggestions(tmp_path):
+    assert Catalog(str(tmp_path / "none.idx")).lookup("two") == []
@@ -0,0 +1,26 @@
+import json
+
+from dsa_store import HistoryStore
+
+
+def test_legacy_json_is_imported_and_left_untouched(tmp_path):
+    legacy = tmp_path / "dsa_progress.json"
+    journal = tmp_path / "dsa_progress.journal"
+    legacy.write_text(json.dumps({
+        "date": "2026-01-01", "seq": 1, "topic": "Graphs", "quote": "Q",
+        "questions": [{"text": "BFS", "completed": True}],
+    }))
+    # One record already in the snapshot, two new ones and a torn tail
+    journal.write_text(
+        '{"op":"add","text":"BFS","seq":1}\n'
+        '{"op":"add","text":"DFS","seq":2}\n'
+        '{"op":"set","index":1,"completed":true,"seq":3}\n'
+        '{"op":"top'
+    )
+    before = legacy.read_bytes(), journal.read_bytes()
+
+    store = HistoryStore(str(tmp_path / "h.db"), legacy_json=str(legacy))
+    assert list(store.iterQuestions(date="2026-01-01")) == [
+        ("2026-01-01", "Graphs", "BFS", 1), ("2026-01-01", "Graphs", "DFS", 1)]
+    store.close()
+    assert (legacy.read_bytes(), journal.read_bytes()) == before
@@ -0,0 +1,43 @@
+import sqlite3
+
+from dsa_review import AGAIN, GOOD, MIN_EASINESS, START_EASINESS, dueAfter, sm2
+from dsa_store import HistoryStore
+
+
+def test_sm2_intervals_grow_after_good_recalls():
+    easiness, interval, repetitions = START_EASINESS, 0, 0
+    intervals = []
+    for _ in range(4):
+        easiness, interval, repetitions = sm2(easiness, interval, repetitions, GOOD)
+        intervals.append(interval)
+    assert intervals[:2] == [1, 6]
+    assert intervals[2] > 6 and intervals[3] > intervals[2]
+
+
+def test_sm2_failed_recall_starts_over():
+    easiness, interval, repetitions = sm2(2.0, 15, 3, AGAIN)
+    assert (interval, repetitions) == (1, 0)
+    assert MIN_EASINESS <= easiness < 2.0
+
+
+def test_due_after_crosses_months():
+    assert dueAfter("2026-01-30", 6) == "2026-02-05"
+
+
+def test_solved_question_comes_back_on_a_later_day(tmp_path):
+    path = str(tmp_path / "h.db")
+    store = HistoryStore(path)
+    store.addQuestion("Two Sum")
+    store.setCompleted(0, True)
+    store.close()
+    # Pretend that day was long ago
+    db = sqlite3.connect(path)
+    with db:
+        db.execute("UPDATE days SET date = '2000-01-01'")
+    db.close()
+
+    store = HistoryStore(path)
+    assert [(q.text, q.completed, q.review is not None) for q in store.questions] == [
+        ("Two Sum", False, True)]
+    assert store.dueCount() == 1
+    store.close()
@@ -0,0 +1,84 @@
+import pytest
+
+import dsa_store
+from dsa_store import HistoryStore, parseQuery
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    """A history of two days, one per topic, open on the second."""
+    path = str(tmp_path / "h.db")
+    monkeypatch.setattr(HistoryStore, '_queueReviews', lambda self: None)
+    days = [
+        ("2026-03-01", "Arrays", ["Two Sum", "Two Pointers on 100% sorted input",
+                                  "Say \"hello\" backwards"]),
+        ("2026-03-02", "Graphs", ["Course Schedule", "C++ graph_utils templates",
+                                  "Two-colour a bipartite graph"]),
+    ]
+    for date, topic, texts in days:
+        monkeypatch.setattr(dsa_store, 'today_str', lambda: date)
+        store = HistoryStore(path)
+        store.setTopic(topic)
+        for text in texts:
+            store.addQuestion(text)
+        store.setCompleted(0, True)
+        store.flush()
+        if date != days[-1][0]:
+            store.close()
+    yield store
+    store.close()
+
+
+def texts(rows):
+    return sorted(text for _, _, text, _ in rows)
+
+
+def test_parse_query_splits_out_the_topic():
+    assert parseQuery("two  sum topic:arr") == (["two", "sum"], "arr")
+    assert parseQuery("Topic:Graphs") == ([], "Graphs")
+    # An empty filter is no filter
+    assert parseQuery("sum topic:") == (["sum"], None)
+
+
+def test_words_match_as_prefixes(store):
+    if not store.has_fts:
+        pytest.skip("SQLite built without FTS5")
+    assert texts(store.search("tw su")) == ["Two Sum"]
+    assert texts(store.search("two")) == [
+        "Two Pointers on 100% sorted input", "Two Sum", "Two-colour a bipartite graph"]
+    date, topic, text, completed = store.search("sum")[0]
+    assert (date, topic, text, completed) == ("2026-03-01", "Arrays", "Two Sum", 1)
+
+
+def test_query_syntax_is_quoted(store):
+    if not store.has_fts:
+        pytest.skip("SQLite built without FTS5")
+    # Each would be an FTS5 syntax error or operator if passed through as is
+    assert texts(store.search('"hello')) == ["Say \"hello\" backwards"]
+    # "c++" tokenizes to the prefix "c"
+    assert texts(store.search("c++")) == [
+        "C++ graph_utils templates", "Course Schedule", "Two-colour a bipartite graph"]
+    assert texts(store.search("-colour")) == ["Two-colour a bipartite graph"]
+    assert texts(store.search("AND")) == []
+
+
+def test_like_fallback_without_fts(store):
+    store.has_fts = False
+    # Substrings rather than prefixes
+    assert texts(store.search("wo um")) == ["Two Sum"]
+    # LIKE wildcards in the query are literal
+    assert texts(store.search("100%")) == ["Two Pointers on 100% sorted input"]
+    assert texts(store.search("h_u")) == ["C++ graph_utils templates"]
+    assert texts(store.search("%")) == ["Two Pointers on 100% sorted input"]
+
+
+@pytest.mark.parametrize('fts', [True, False])
+def test_topic_filter(store, fts):
+    if fts and not store.has_fts:
+        pytest.skip("SQLite built without FTS5")
+    store.has_fts = fts
+    assert texts(store.search("two topic:arr")) == ["Two Pointers on 100% sorted input", "Two Sum"]
+    assert texts(store.search("topic:GRA")) == [
+        "C++ graph_utils templates", "Course Schedule", "Two-colour a bipartite graph"]
+    assert store.search("topic:trees") == []
+    assert store.search("") == []
@@ -0,0 +1,34 @@
+import os
+import socket
+
+import dsa_service
+from dsa_core import Tracker
+from dsa_service import TrackerService, connect
+from dsa_store import HistoryStore
+
+
+def test_request_that_is_not_an_object_gets_an_error(tmp_path):
+    service = TrackerService(Tracker(HistoryStore(str(tmp_path / "h.db"))), None)
+    assert 'error' in service.handle([1], None)
+    reply = service.handle({'id': 3, 'op': 'nope'}, None)
+    assert reply['id'] == 3 and 'error' in reply
+    service.tracker.close()
+
+
+def test_tcp_connect_only_tried_when_the_service_advertises_it(tmp_path, monkeypatch):
+    monkeypatch.setattr(dsa_service, 'SERVICE_MARKER', str(tmp_path / "service.port"))
+    listener = socket.socket()
+    listener.bind(('127.0.0.1', 0))
+    listener.listen(1)
+    address = f"127.0.0.1:{listener.getsockname()[1]}"
+    try:
+        assert connect(address) is None
+        dsa_service._advertise(address)
+        client = connect(address)
+        assert client is not None
+        client.close()
+    finally:
+        listener.close()
+    # Nothing listens any more, so the stale marker is removed
+    assert connect(address) is None
+    assert not os.path.exists(dsa_service.SERVICE_MARKER)
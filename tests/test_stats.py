@@ -0,0 +1,114 @@
+from datetime import date, timedelta
+
+import pytest
+
+import dsa_store
+from dsa_core import Tracker
+from dsa_stats import StatsEngine
+from dsa_store import HistoryStore
+
+TODAY = date(2026, 3, 11)
+
+
+@pytest.fixture
+def history(tmp_path, monkeypatch):
+    """``open(days_ago)`` opens a Tracker on that day of one history db."""
+    path = str(tmp_path / "h.db")
+    # Keep the review queue from adding yesterday's questions to each day
+    monkeypatch.setattr(HistoryStore, '_queueReviews', lambda self: None)
+
+    def open_day(days_ago):
+        day = (TODAY - timedelta(days=days_ago)).isoformat()
+        monkeypatch.setattr(dsa_store, 'today_str', lambda: day)
+        return Tracker(HistoryStore(path))
+    return open_day
+
+
+def record(history, days_ago, total, done, topic=''):
+    tracker = history(days_ago)
+    tracker.setTopic(topic)
+    tracker.addQuestions([f"q{i}" for i in range(total)])
+    for i in range(done):
+        tracker.setCompleted(i, True)
+    tracker.close()
+
+
+def test_gap_breaks_the_streak_and_an_empty_today_does_not(history):
+    record(history, 5, 1, 1)
+    record(history, 4, 1, 1)
+    record(history, 3, 2, 1)
+    # Questions but none solved is as much a gap as no day at all
+    record(history, 2, 3, 0)
+    record(history, 1, 1, 1)
+    tracker = history(0)
+    stats = StatsEngine(tracker)
+    assert stats.currentStreak() == 1
+    assert stats.longestStreak() == 3
+
+    tracker.addQuestion("today")
+    tracker.setCompleted(0, True)
+    assert stats.refresh()
+    assert stats.currentStreak() == 2
+    assert stats.counts(TODAY) == (1, 1)
+    tracker.close()
+
+
+def test_streak_is_zero_when_yesterday_was_missed(history):
+    record(history, 2, 1, 1)
+    tracker = history(0)
+    stats = StatsEngine(tracker)
+    assert stats.currentStreak() == 0
+    assert stats.longestStreak() == 1
+    tracker.close()
+
+
+def test_weekly_velocity_counts_today_live(history):
+    record(history, 1, 3, 2)
+    record(history, 6, 1, 1)
+    # Day 7 is the first day of last week
+    record(history, 7, 2, 2)
+    record(history, 13, 1, 1)
+    record(history, 14, 5, 5)
+    tracker = history(0)
+    stats = StatsEngine(tracker)
+    assert stats.weeklyVelocity() == (3, 3)
+    tracker.addQuestion("today")
+    tracker.setCompleted(0, True)
+    stats.refresh()
+    assert stats.weeklyVelocity() == (4, 3)
+    tracker.close()
+
+
+def test_today_is_not_counted_twice_in_topic_rates(history):
+    record(history, 1, 2, 1, topic="Arrays")
+    tracker = history(0)
+    tracker.setTopic("Arrays")
+    tracker.addQuestions(["a", "b"])
+    tracker.setCompleted(0, True)
+    # The stored Arrays counters already include today
+    stats = StatsEngine(tracker)
+    assert stats.topicRates() == [("Arrays", 2, 4, 0.5)]
+    tracker.setCompleted(1, True)
+    stats.refresh()
+    assert stats.topicRates() == [("Arrays", 3, 4, 0.75)]
+    tracker.close()
+
+
+def test_topic_changed_mid_day_moves_today_to_the_new_topic(history):
+    record(history, 1, 2, 1, topic="Arrays")
+    record(history, 2, 3, 3, topic="Graphs")
+    tracker = history(0)
+    tracker.setTopic("Graphs")
+    tracker.addQuestions(["a", "b"])
+    tracker.setCompleted(0, True)
+    stats = StatsEngine(tracker)
+    assert dict((t, (d, n)) for t, d, n, _ in stats.topicRates()) == {
+        "Graphs": (4, 5), "Arrays": (1, 2)}
+
+    tracker.setTopic("Arrays")
+    assert stats.refresh()
+    assert dict((t, (d, n)) for t, d, n, _ in stats.topicRates()) == {
+        "Graphs": (3, 3), "Arrays": (2, 4)}
+    # Most practised first
+    assert [t for t, *_ in stats.topicRates()] == ["Arrays", "Graphs"]
+    tracker.close()
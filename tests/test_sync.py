@@ -0,0 +1,141 @@
+import os
+import shutil
+
+from dsa_core import Tracker
+from dsa_store import HistoryStore, Question
+from dsa_sync import DaySnapshot, mergeDay
+
+
+def snapshot(rows, topic='', quote=None, day_id=1):
+    return DaySnapshot(topic, quote, dict(rows), day_id, len(rows))
+
+
+def test_unchanged_sides_make_an_empty_plan():
+    rows = {(1, 'a'): False, (2, 'b'): True}
+    local = [Question('a', False, 1), Question('b', True, 2)]
+    plan = mergeDay(snapshot(rows), local, '', None, snapshot(rows))
+    assert not plan
+    assert plan.conflicts == []
+
+
+def test_one_sided_changes_are_taken():
+    base = snapshot({(1, 'a'): False, (2, 'b'): False})
+    disk = snapshot({(1, 'a'): True, (2, 'b'): False, (3, 'c'): False}, topic='Graphs')
+    local = [Question('a', False, 1), Question('b', True, 2)]
+    plan = mergeDay(base, local, '', None, disk)
+    assert plan.complete == [(local[0], True)]
+    assert plan.write_set == [local[1]]
+    assert plan.append == [(3, 'c', False)]
+    assert plan.fields == {'topic': 'Graphs'}
+    assert plan.conflicts == []
+
+
+def test_removal_on_one_side():
+    base = snapshot({(1, 'a'): False, (2, 'b'): False})
+    disk = snapshot({(2, 'b'): False, (3, 'c'): True})
+    local = [Question('a', False, 1)]
+    plan = mergeDay(base, local, '', None, disk)
+    # Removed on disk and untouched here; removed here and untouched on disk
+    assert plan.remove == [local[0]]
+    assert plan.write_remove == [(2, 'b')]
+    assert plan.conflicts == []
+
+
+def test_true_conflict_keeps_the_local_version():
+    base = snapshot({(1, 'a'): False}, topic='Arrays')
+    disk = snapshot({}, topic='Trees')
+    local = [Question('a', True, 1)]
+    plan = mergeDay(base, local, 'Graphs', None, disk)
+    assert plan.write_add == [local[0]]
+    assert plan.write_fields == {'topic': 'Graphs'}
+    assert len(plan.conflicts) == 2
+
+
+def test_same_question_added_on_both_copies_is_matched_by_text():
+    base = snapshot({})
+    disk = snapshot({(7, 'a'): False})
+    local = [Question('a', False, 3)]
+    plan = mergeDay(base, local, '', None, disk)
+    assert plan.ids == [(local[0], 7)]
+    assert not plan.write_add and not plan.append
+
+
+def test_replaced_file_keeps_rows_written_since_the_last_read(tmp_path):
+    path, copy = str(tmp_path / "h.db"), str(tmp_path / "copy.db")
+    tracker = Tracker(HistoryStore(path))
+    tracker.addQuestions(["q1", "q2"])
+
+    # The sync client hands the file to another machine, which checks q1
+    shutil.copy(path, copy)
+    other = Tracker(HistoryStore(copy))
+    other.setCompleted(0, True)
+    other.close()
+    # Meanwhile this window adds a question, then the other copy comes back
+    tracker.addQuestion("q3")
+    os.replace(copy, path)
+
+    assert tracker.syncFromDisk() == []
+    assert [(q.text, q.completed) for q in tracker.questions] == [
+        ("q1", True), ("q2", False), ("q3", False)]
+    tracker.close()
+
+    reopened = HistoryStore(path)
+    assert [(q.text, q.completed) for q in reopened.questions] == [
+        ("q1", True), ("q2", False), ("q3", False)]
+    reopened.close()
+
+
+def test_replaced_file_reports_no_conflict_for_rows_written_here(tmp_path):
+    path, copy = str(tmp_path / "h.db"), str(tmp_path / "copy.db")
+    tracker = Tracker(HistoryStore(path))
+    tracker.addQuestions(["q1", "q2"])
+    shutil.copy(path, copy)
+    other = Tracker(HistoryStore(copy))
+    other.setCompleted(0, True)
+    other.close()
+    tracker.setCompleted(1, True)
+    os.replace(copy, path)
+
+    assert tracker.syncFromDisk() == []
+    # q1 was checked on top of this process's write, q2 was never touched there
+    assert tracker.questions[0].completed
+    assert tracker.questions[1].completed
+    tracker.close()
+    reopened = HistoryStore(path)
+    assert reopened.questions[0].completed
+    assert reopened.questions[1].completed
+    reopened.close()
+
+
+def test_replaced_file_reports_rows_both_copies_wrote(tmp_path):
+    path, copy = str(tmp_path / "h.db"), str(tmp_path / "copy.db")
+    tracker = Tracker(HistoryStore(path))
+    tracker.addQuestions(["q1", "q2"])
+    shutil.copy(path, copy)
+    # The other copy toggles q2 twice, so neither side saw the other's write
+    other = Tracker(HistoryStore(copy))
+    other.setCompleted(1, True)
+    other.setCompleted(1, False)
+    other.close()
+    tracker.setCompleted(1, True)
+    os.replace(copy, path)
+
+    assert len(tracker.syncFromDisk()) == 1
+    assert tracker.questions[1].completed
+    tracker.close()
+    reopened = HistoryStore(path)
+    assert reopened.questions[1].completed
+    reopened.close()
+
+
+def test_unstamped_writes_get_a_new_revision(tmp_path):
+    path = str(tmp_path / "h.db")
+    store = HistoryStore(path)
+    store.addQuestion("q1")
+    store.flush()
+    before = store._db.execute("SELECT revision FROM questions").fetchone()[0]
+    store._db.execute("UPDATE questions SET completed = 1")
+    revision, parent = store._db.execute(
+        "SELECT revision, parent_revision FROM questions").fetchone()
+    assert parent == before and revision != before
+    store.close()